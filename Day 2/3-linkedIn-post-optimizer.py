@@ -1,14 +1,13 @@
-import os
+import sys
+from pathlib import Path
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import PromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
-from dotenv import load_dotenv
 
-load_dotenv()
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash-lite", google_api_key=os.getenv("GOOGLE_API_KEY"))
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from agentkit import CompiledPromptTemplate
+from agentkit.llm import get_llm
 
 # Create the prompt template
-linkedin_prompt = PromptTemplate(
+linkedin_prompt = CompiledPromptTemplate(
     input_variables=["rough_idea", "target_audience"],
     template="""
     Transform this rough idea into an engaging LinkedIn post:
@@ -29,13 +28,18 @@ linkedin_prompt = PromptTemplate(
 
 # Create the chain
 # rough_idea → prompt → LLM → clean output
-linkedin_chain = linkedin_prompt | llm | StrOutputParser()
+def build_linkedin_chain(llm=None):
+    return linkedin_prompt | (llm or get_llm()) | StrOutputParser()
 
-#Use it!
-result = linkedin_chain.invoke({
-    "rough_idea": "I learned that most people don't know how to write good prompts for AI",
-    "target_audience": "developers and tech professionals"
-})
 
-print("OPTIMIZED LINKEDIN POST:")
-print(result)
+if __name__ == "__main__":
+    linkedin_chain = build_linkedin_chain()
+
+    #Use it!
+    result = linkedin_chain.invoke({
+        "rough_idea": "I learned that most people don't know how to write good prompts for AI",
+        "target_audience": "developers and tech professionals"
+    })
+
+    print("OPTIMIZED LINKEDIN POST:")
+    print(result)
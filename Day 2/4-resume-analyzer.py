@@ -1,21 +1,18 @@
-import os
+import sys
+from pathlib import Path
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import PromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
-from dotenv import load_dotenv
 
-load_dotenv()
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from agentkit import CompiledPromptTemplate
+from agentkit.llm import get_llm
+
 
 class ResumeAnalyzerAgent:
-    def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash-lite",
-            google_api_key=os.getenv("GOOGLE_API_KEY"),
-            temperature=0.3
-        )
+    def __init__(self, llm=None):
+        self.llm = llm or get_llm(temperature=0.3)
 
         # The analysis prompt template
-        self.analysis_prompt = PromptTemplate(
+        self.analysis_prompt = CompiledPromptTemplate(
             input_variables=["resume_text", "job_role"],
             template="""
             Analyze this resume for a {job_role} position:
@@ -51,8 +48,6 @@ class ResumeAnalyzerAgent:
 
 
 # Test it with a dummy resume content
-analyzer = ResumeAnalyzerAgent()
-
 sample_resume = """
 Rohit Sharma
 Software Developer
@@ -67,5 +62,7 @@ Skills: JavaScript, Python, React, Node.js
 Education: Computer Science degree
 """
 
-result = analyzer.analyze(sample_resume, "Senior Frontend Developer")
-print(result)
+if __name__ == "__main__":
+    analyzer = ResumeAnalyzerAgent()
+    result = analyzer.analyze(sample_resume, "Senior Frontend Developer")
+    print(result)
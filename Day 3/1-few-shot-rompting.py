@@ -1,12 +1,13 @@
-import os
+import re
+import sys
+from pathlib import Path
+from typing import Optional
 
-from langchain_core.prompts import PromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
-from dotenv import load_dotenv
+from pydantic import BaseModel, Field
 
-load_dotenv()
-
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash-lite", google_api_key=os.getenv("GOOGLE_API_KEY"))
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from agentkit import CompiledPromptTemplate
+from agentkit.llm import get_llm
 
 promptTemplate = """
 Analyze the sentiment of product reviews. Classify as POSITIVE, NEGATIVE, 
@@ -37,13 +38,51 @@ Reason:
 """
 
 # Few-shot prompt template
-sentiment_analyzer = PromptTemplate(
+sentiment_analyzer = CompiledPromptTemplate(
     input_variables=["review"],
     template=promptTemplate
 )
 
+
+class SentimentResult(BaseModel):
+    sentiment: str = Field(description="POSITIVE, NEGATIVE, or NEUTRAL")
+    confidence: Optional[int] = Field(default=None, description="Confidence in percent")
+    reason: str = Field(default="", description="Why the review got this label")
+
+
+# Also matches markdown answers such as "**Sentiment:** NEGATIVE" or "- *Reason*: ..."
+SENTIMENT_LINE = re.compile(
+    r"^[ \t>*_-]*(Sentiment|Confidence|Reason)[ \t*_]*:[ \t*_]*(.*?)[ \t*_]*$", re.IGNORECASE | re.MULTILINE
+)
+
+
+def parse_sentiment(text: str) -> SentimentResult:
+    """Parse the Sentiment/Confidence/Reason block the model answers with"""
+    fields = {}
+    for key, value in SENTIMENT_LINE.findall(text):
+        # The answer may echo the examples; the last block is the real one
+        fields[key.lower()] = value
+    if not fields.get("sentiment"):
+        raise ValueError(f"No sentiment found in: {text[:200]!r}")
+    confidence = re.search(r"\d+", fields.get("confidence", ""))
+    return SentimentResult(
+        sentiment=fields["sentiment"].upper(),
+        confidence=int(confidence.group()) if confidence else None,
+        reason=fields.get("reason", ""),
+    )
+
+
 # Test it
 test_review = "The features are decent but the pricing is way too high for what you get"
 
-result = llm.invoke(sentiment_analyzer.format(review=test_review))
-print(result.content)
+if __name__ == "__main__":
+    llm = get_llm()
+    result = llm.invoke(sentiment_analyzer.format(review=test_review))
+    print(result.content)
+
+    try:
+        sentiment = parse_sentiment(result.content)
+    except ValueError as error:
+        print(f"\nCould not parse the answer: {error}")
+    else:
+        print(f"\nParsed: {sentiment.sentiment} ({sentiment.confidence}%)")
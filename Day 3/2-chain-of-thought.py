@@ -1,13 +1,11 @@
-import os
+import sys
+from pathlib import Path
 
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import PromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
-from dotenv import load_dotenv
 
-load_dotenv()
-
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash-lite", google_api_key=os.getenv("GOOGLE_API_KEY"))
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from agentkit import CompiledPromptTemplate
+from agentkit.llm import get_llm
 
 promptTemplate = """
 You're a business consultant. Analyze this scenario step-by-step and provide actionable recommendations.
@@ -35,13 +33,15 @@ Business Scenario: {business_scenario}
 Let me work through this step-by-step:
 """
 
-reasoning_prompt = PromptTemplate(
+reasoning_prompt = CompiledPromptTemplate(
     input_variables=["business_scenario"],
     template=promptTemplate
 )
 
 # Create the chain
-business_analyzer = reasoning_prompt | llm | StrOutputParser()
+def build_business_analyzer(llm=None):
+    return reasoning_prompt | (llm or get_llm()) | StrOutputParser()
+
 
 # Test with real scenario
 scenario = """
@@ -50,5 +50,7 @@ Cart abandonment rate is 75%. Customer support says people complain about
 shipping costs being too high, but we can't reduce them without losing money.
 """
 
-result = business_analyzer.invoke({"business_scenario": scenario})
-print(result)
+if __name__ == "__main__":
+    business_analyzer = build_business_analyzer()
+    result = business_analyzer.invoke({"business_scenario": scenario})
+    print(result)
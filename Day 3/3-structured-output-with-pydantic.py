@@ -1,15 +1,16 @@
-import os
+import sys
+from pathlib import Path
 
-from langchain_core.prompts import PromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
-from dotenv import load_dotenv
 from pydantic import BaseModel, Field
-from langchain.output_parsers import PydanticOutputParser
+from langchain_core.output_parsers import PydanticOutputParser, StrOutputParser
 from typing import List
 
-load_dotenv()
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from agentkit import CompiledPromptTemplate
+from agentkit.llm import get_llm
+from agentkit.postprocess import ParseSpec
+from agentkit.schema_cache import cached_format_instructions
 
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash-lite", google_api_key=os.getenv("GOOGLE_API_KEY"))
 
 # Define the structure you want
 class CompetitorAnalysis(BaseModel):
@@ -20,8 +21,20 @@ class CompetitorAnalysis(BaseModel):
     threat_level: str = Field(description="HIGH, MEDIUM, or LOW threat level")
     key_insight: str = Field(description="Most important strategic insight")
 
-# Create parser
-parser = PydanticOutputParser(pydantic_object=CompetitorAnalysis)
+
+def format_competitor_analysis(analysis: CompetitorAnalysis) -> str:
+    return "\n".join([
+        f"Company: {analysis.company_name}",
+        f"Threat Level: {analysis.threat_level}",
+        f"Strengths: {', '.join(analysis.strengths)}",
+        f"Key Insight: {analysis.key_insight}",
+    ])
+
+
+# How a ParseStage worker parses (and formats) this chain's output
+SCRIPT = "Day 3/3-structured-output-with-pydantic.py"
+COMPETITOR_PARSE = ParseSpec(model=f"{SCRIPT}:CompetitorAnalysis")
+COMPETITOR_REPORT = ParseSpec(model=f"{SCRIPT}:CompetitorAnalysis", formatter=f"{SCRIPT}:format_competitor_analysis")
 
 promptTemplate = """
 Analyze this competitor based on publicly available information.
@@ -32,23 +45,29 @@ Industry Context: {industry_context}
 
 {format_instructions}
 """
-# Build prompt with format instructions
-competitor_prompt = PromptTemplate(
-    template=promptTemplate,
-    input_variables=["company_name", "industry_context"],
-    partial_variables={"format_instructions": parser.get_format_instructions()}
-)
-
-# Create the analysis chain
-competitor_analyzer = competitor_prompt | llm | parser
-
-# Test it
-analysis = competitor_analyzer.invoke({
-    "company_name": "Notion",
-    "industry_context": "Productivity and collaboration tools for knowledge workers"
-})
-
-print(f"Company: {analysis.company_name}")
-print(f"Threat Level: {analysis.threat_level}")
-print(f"Strengths: {', '.join(analysis.strengths)}")
-print(f"Key Insight: {analysis.key_insight}")
+# Create the analysis chain. The parser and prompt are built here rather
+# than at import time; the format instructions come from the on-disk cache.
+# With a ParseStage, ainvoke/abatch validate the output in its process pool.
+def build_competitor_analyzer(llm=None, parse_stage=None):
+    if parse_stage is not None:
+        parser = StrOutputParser() | parse_stage.as_runnable(COMPETITOR_PARSE)
+    else:
+        parser = PydanticOutputParser(pydantic_object=CompetitorAnalysis)
+    competitor_prompt = CompiledPromptTemplate(
+        template=promptTemplate,
+        input_variables=["company_name", "industry_context"],
+        partial_variables={"format_instructions": cached_format_instructions(CompetitorAnalysis)}
+    )
+    return competitor_prompt | (llm or get_llm()) | parser
+
+
+if __name__ == "__main__":
+    competitor_analyzer = build_competitor_analyzer()
+
+    # Test it
+    analysis = competitor_analyzer.invoke({
+        "company_name": "Notion",
+        "industry_context": "Productivity and collaboration tools for knowledge workers"
+    })
+
+    print(format_competitor_analysis(analysis))
@@ -1,16 +1,22 @@
-import os
+import sys
+from pathlib import Path
 from typing import List
 
-from dotenv import load_dotenv
-from langchain.output_parsers import PydanticOutputParser
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import PromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.output_parsers import PydanticOutputParser, StrOutputParser
 from pydantic import BaseModel, Field
 
-load_dotenv()
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from agentkit import CompiledPromptTemplate
+from agentkit.llm import FALLBACK_MODEL, get_llm
+from agentkit.postprocess import ParseSpec
+from agentkit.routing import HedgedChatModel
+from agentkit.schema_cache import cached_format_instructions
+
+
+def build_llm():
+    """Gemini with hedged requests and a cheaper tier for low-priority calls"""
+    return HedgedChatModel(primary=get_llm(), fallback=get_llm(FALLBACK_MODEL))
 
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash-lite", google_api_key=os.getenv("GOOGLE_API_KEY"))
 
 # Define structured outputs
 class JobAnalysis(BaseModel):
@@ -29,14 +35,22 @@ class CoverLetterContent(BaseModel):
     tone_style: str = Field(description="Professional tone to match company culture")
 
 
+# How a ParseStage worker validates each structured output
+SCRIPT = "Day 3/4-smart-job-application-assistant.py"
+JOB_ANALYSIS_PARSE = ParseSpec(model=f"{SCRIPT}:JobAnalysis")
+COVER_LETTER_PARSE = ParseSpec(model=f"{SCRIPT}:CoverLetterContent")
+
+
 class JobApplicationAssistant:
-    def __init__(self):
-        self.llm = llm
+    def __init__(self, llm=None, parse_stage=None):
+        self.llm = llm or build_llm()
+        # Interview prep is nice-to-have: serve it from the cheaper tier
+        self.interview_llm = self.llm.with_priority("low") if isinstance(self.llm, HedgedChatModel) else self.llm
 
         # Job analysis chain
-        self.job_parser = PydanticOutputParser(pydantic_object=JobAnalysis)
+        self.job_parser = self._parser(JobAnalysis, JOB_ANALYSIS_PARSE, parse_stage)
 
-        self.job_analysis_prompt = PromptTemplate(
+        self.job_analysis_prompt = CompiledPromptTemplate(
             template="""
 You're a senior recruiter with 15+ years experience. Analyze this job posting strategically.
 
@@ -48,13 +62,13 @@ Extract key insights that will help a candidate craft a winning application:
 {format_instructions}
 """,
             input_variables=["job_posting"],
-            partial_variables={"format_instructions": self.job_parser.get_format_instructions()}
+            partial_variables={"format_instructions": cached_format_instructions(JobAnalysis)}
         )
 
         # Cover letter generation chain
-        self.cover_letter_parser = PydanticOutputParser(pydantic_object=CoverLetterContent)
+        self.cover_letter_parser = self._parser(CoverLetterContent, COVER_LETTER_PARSE, parse_stage)
 
-        self.cover_letter_prompt = PromptTemplate(
+        self.cover_letter_prompt = CompiledPromptTemplate(
             template="""
 You're a career coach who's helped hundreds get dream jobs. 
 
@@ -73,11 +87,11 @@ Rules for an outstanding cover letter:
 {format_instructions}
 """,
             input_variables=["job_analysis", "candidate_background"],
-            partial_variables={"format_instructions": self.cover_letter_parser.get_format_instructions()}
+            partial_variables={"format_instructions": cached_format_instructions(CoverLetterContent)}
         )
 
         # Interview prep chain
-        self.interview_prep_prompt = PromptTemplate(
+        self.interview_prep_prompt = CompiledPromptTemplate(
             template="""
 You're an interview coach. Based on this job analysis, prepare the candidate.
 
@@ -104,6 +118,13 @@ Common mistakes candidates make for this type of role.
             input_variables=["job_analysis"]
         )
 
+    @staticmethod
+    def _parser(model, spec, parse_stage):
+        """Validate inline, or in the ParseStage process pool for async calls"""
+        if parse_stage is None:
+            return PydanticOutputParser(pydantic_object=model)
+        return StrOutputParser() | parse_stage.as_runnable(spec)
+
     def analyze_job(self, job_posting: str):
         """Analyze job posting for key insights"""
         analysis_chain = self.job_analysis_prompt | self.llm | self.job_parser
@@ -119,13 +140,26 @@ Common mistakes candidates make for this type of role.
 
     def prepare_interview(self, job_analysis: JobAnalysis):
         """Generate interview preparation materials"""
-        interview_chain = self.interview_prep_prompt | self.llm | StrOutputParser()
+        interview_chain = self.interview_prep_prompt | self.interview_llm | StrOutputParser()
         return interview_chain.invoke({"job_analysis": job_analysis.dict()})
 
+    async def aanalyze_job(self, job_posting: str):
+        analysis_chain = self.job_analysis_prompt | self.llm | self.job_parser
+        return await analysis_chain.ainvoke({"job_posting": job_posting})
+
+    async def agenerate_cover_letter(self, job_analysis: JobAnalysis, candidates_background: str):
+        cover_letter_chain = self.cover_letter_prompt | self.llm | self.cover_letter_parser
+        return await cover_letter_chain.ainvoke({
+            "job_analysis": job_analysis.dict(),
+            "candidate_background": candidates_background
+        })
+
+    async def aprepare_interview(self, job_analysis: JobAnalysis):
+        interview_chain = self.interview_prep_prompt | self.interview_llm | StrOutputParser()
+        return await interview_chain.ainvoke({"job_analysis": job_analysis.dict()})
 
-# Test with real job posting
-assistant = JobApplicationAssistant()
 
+# Test with real job posting
 sample_job_posting = """
 Senior Frontend Developer - TechFlow Solutions
 
@@ -154,18 +188,21 @@ Expert in TypeScript and have worked on checkout flows optimization. Led a team
 at my current company. Passionate about user experience and have side projects in fintech.
 """
 
-print("=== JOB ANALYSIS ===")
-analysis = assistant.analyze_job(sample_job_posting)
-print(f"Role: {analysis.role_title}")
-print(f"Experience Level: {analysis.experience_level}")
-print(f"Key Requirements: {', '.join(analysis.key_requirements)}")
-print(f"Strategy: {analysis.application_strategy}")
-
-print("\n=== COVER LETTER STRUCTURE ===")
-cover_letter = assistant.generate_cover_letter(analysis, candidate_background)
-print(f"Opening Hook: {cover_letter.opening_hook}")
-print(f"Tone: {cover_letter.tone_style}")
-
-print("\n=== INTERVIEW PREP ===")
-interview_prep = assistant.prepare_interview(analysis)
-print(interview_prep)
+if __name__ == "__main__":
+    assistant = JobApplicationAssistant()
+
+    print("=== JOB ANALYSIS ===")
+    analysis = assistant.analyze_job(sample_job_posting)
+    print(f"Role: {analysis.role_title}")
+    print(f"Experience Level: {analysis.experience_level}")
+    print(f"Key Requirements: {', '.join(analysis.key_requirements)}")
+    print(f"Strategy: {analysis.application_strategy}")
+
+    print("\n=== COVER LETTER STRUCTURE ===")
+    cover_letter = assistant.generate_cover_letter(analysis, candidate_background)
+    print(f"Opening Hook: {cover_letter.opening_hook}")
+    print(f"Tone: {cover_letter.tone_style}")
+
+    print("\n=== INTERVIEW PREP ===")
+    interview_prep = assistant.prepare_interview(analysis)
+    print(interview_prep)
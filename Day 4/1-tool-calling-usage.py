@@ -1,12 +1,12 @@
-from langchain.tools import Tool, StructuredTool
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.agents import create_tool_calling_agent, AgentExecutor
-from langchain.prompts import ChatPromptTemplate
+from langchain_core.tools import Tool, StructuredTool
+from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
-import os
-from dotenv import load_dotenv
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from agentkit.llm import get_llm
 
-load_dotenv()
 
 # Single-parameter function (can use regular Tool)
 def get_weather(location: str) -> str:
@@ -57,8 +57,6 @@ tip_calculator = StructuredTool(
 )
 
 # Create the agent
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash-lite", google_api_key=os.getenv("GOOGLE_API_KEY"))
-
 tools = [weather_tool, tip_calculator]
 
 prompt = ChatPromptTemplate.from_messages([
@@ -75,28 +73,45 @@ Be conversational and helpful in your responses."""),
 ])
 
 # Create agent and executor
-agent = create_tool_calling_agent(
-    llm=llm,
-    tools=tools,
-    prompt=prompt
-)
-
-agent_executor = AgentExecutor(
-    agent=agent,
-    tools=tools,
-    verbose=True,
-    handle_parsing_errors=True
-)
-
-# Test the corrected agent
-print("=== WEATHER QUERY ===")
-result = agent_executor.invoke({"input": "What's the weather like in Tokyo?"})
-print(result["output"])
-
-print("\n=== TIP CALCULATION ===")
-result = agent_executor.invoke({"input": "I have a $85 dinner bill and want to tip 18%. What's the total?"})
-print(result["output"])
-
-print("\n=== COMPLEX QUERY ===")
-result = agent_executor.invoke({"input": "Check the weather in London and help me calculate a 20% tip for a $150 bill"})
-print(result["output"])
+def build_agent_executor(llm=None):
+    # Imported here: langchain.agents is slow to import
+    from langchain.agents import create_tool_calling_agent
+
+    from agentkit.budget import BudgetedAgentExecutor, RunBudget
+
+    llm = llm or get_llm()
+    agent = create_tool_calling_agent(
+        llm=llm,
+        tools=tools,
+        prompt=prompt
+    )
+
+    # Every request gets a time, LLM-call and token budget; when it runs low
+    # (or the model repeats a tool call) the answer is written from tool results so far
+    return BudgetedAgentExecutor(
+        agent=agent,
+        tools=tools,
+        verbose=True,
+        handle_parsing_errors=True,
+        budget=RunBudget(max_seconds=30, max_llm_calls=5, max_tokens=12000),
+        final_answer_llm=llm
+    )
+
+
+if __name__ == "__main__":
+    agent_executor = build_agent_executor()
+
+    # Test the corrected agent
+    print("=== WEATHER QUERY ===")
+    result = agent_executor.invoke({"input": "What's the weather like in Tokyo?"})
+    print(result["output"])
+
+    print("\n=== TIP CALCULATION ===")
+    result = agent_executor.invoke({"input": "I have a $85 dinner bill and want to tip 18%. What's the total?"})
+    print(result["output"])
+
+    print("\n=== COMPLEX QUERY ===")
+    result = agent_executor.invoke({"input": "Check the weather in London and help me calculate a 20% tip for a $150 bill"})
+    print(result["output"])
+
+    print(f"\nBudget metrics: {agent_executor.budget_metrics.as_dict()}")
@@ -1,13 +1,14 @@
-from langchain.tools import Tool, StructuredTool
-from langchain.agents import create_tool_calling_agent, AgentExecutor
-from langchain.prompts import ChatPromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.tools import Tool, StructuredTool
+from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 import random
-import os
-from dotenv import load_dotenv
+import sys
+from pathlib import Path
 
-load_dotenv()
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from agentkit.intent import extract_travel_intent
+from agentkit.llm import FALLBACK_MODEL, get_llm
+from agentkit.prefetch import ToolPrefetcher
 
 
 # ======================
@@ -133,6 +134,34 @@ currency_tool = StructuredTool(
 
 travel_tools = [flight_search_tool, weather_tool, visa_tool, currency_tool]
 
+# ======================
+# SPECULATIVE PREFETCH
+# ======================
+
+def predict_travel_calls(query: str):
+    """Guess the tool calls the agent will make for a query"""
+    intent = extract_travel_intent(query)
+    calls = []
+
+    if intent.destination and intent.month:
+        calls.append(("weather_forecast", {"location": intent.destination, "month": intent.month}))
+    if intent.destination and intent.passport:
+        calls.append(("visa_requirements", {"destination": intent.destination, "passport": intent.passport}))
+    if intent.destination and (intent.amounts or {"flight", "flights", "budget", "visit", "trip"} & set(intent.keywords)):
+        calls.append(("search_flights", {"destination": intent.destination}))
+    if intent.target_currency:
+        for amount, currency in intent.amounts:
+            if currency != intent.target_currency:
+                calls.append(("currency_converter", {
+                    "amount": amount, "from_currency": currency, "to_currency": intent.target_currency
+                }))
+
+    return calls
+
+
+# Tools are started while the first LLM turn is still running
+prefetcher = ToolPrefetcher(travel_tools, predict_travel_calls)
+
 # ======================
 # CREATE AGENT
 # ======================
@@ -161,39 +190,57 @@ explain your reasoning and connect the information logically."""),
 ])
 
 # Create the travel agent
-llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash-lite", google_api_key=os.getenv("GOOGLE_API_KEY"))
+def build_travel_executor(llm=None):
+    from langchain.agents import create_tool_calling_agent
 
-travel_agent = create_tool_calling_agent(
-    llm=llm,
-    tools=travel_tools,
-    prompt=travel_agent_prompt
-)
+    from agentkit.budget import BudgetedAgentExecutor, RunBudget
+    from agentkit.routing import HedgedChatModel
+
+    # Slow answers get a hedged duplicate request, failures go to the cheaper tier
+    llm = llm or HedgedChatModel(primary=get_llm(), fallback=get_llm(FALLBACK_MODEL))
+
+    travel_agent = create_tool_calling_agent(
+        llm=llm,
+        tools=prefetcher.tools,
+        prompt=travel_agent_prompt
+    )
+
+    return BudgetedAgentExecutor(
+        agent=travel_agent,
+        tools=prefetcher.tools,
+        verbose=True,
+        handle_parsing_errors=True,
+        budget=RunBudget(max_seconds=30, max_llm_calls=5, max_tokens=12000),
+        final_answer_llm=llm
+    )
 
-travel_executor = AgentExecutor(
-    agent=travel_agent,
-    tools=travel_tools,
-    verbose=True,
-    handle_parsing_errors=True
-)
 
 # ======================
 # TEST THE AGENT
 # ======================
 
-print("=== COMPREHENSIVE TRAVEL PLANNING ===")
-result = travel_executor.invoke({
-    "input": "I want to visit Japan in October. I'm from the US and have a budget of $2000. What should I know?"
-})
-print(result["output"])
-
-print("\n=== SPECIFIC QUERIES ===")
-result = travel_executor.invoke({
-    "input": "What's the weather like in Japan in March and what are the visa requirements for US citizens?"
-})
-print(result["output"])
-
-print("\n=== BUDGET PLANNING ===")
-result = travel_executor.invoke({
-    "input": "Convert $1500 to Japanese Yen and find flights to Tokyo"
-})
-print(result["output"])
+if __name__ == "__main__":
+    travel_executor = build_travel_executor()
+
+    print("=== COMPREHENSIVE TRAVEL PLANNING ===")
+    result = prefetcher.invoke(travel_executor, {
+        "input": "I want to visit Japan in October. I'm from the US and have a budget of $2000. What should I know?"
+    })
+    print(result["output"])
+
+    print("\n=== SPECIFIC QUERIES ===")
+    result = prefetcher.invoke(travel_executor, {
+        "input": "What's the weather like in Japan in March and what are the visa requirements for US citizens?"
+    })
+    print(result["output"])
+
+    print("\n=== BUDGET PLANNING ===")
+    result = prefetcher.invoke(travel_executor, {
+        "input": "Convert $1500 to Japanese Yen and find flights to Tokyo"
+    })
+    print(result["output"])
+
+    stats = prefetcher.stats
+    print(f"\nPrefetch: {stats.hits} hits, {stats.misses} misses, {stats.wasted} wasted "
+          f"(hit rate {stats.hit_rate:.0%})")
+    print(f"Budget metrics: {travel_executor.budget_metrics.as_dict()}")
@@ -0,0 +1,19 @@
+"""Shared building blocks used by the day-by-day examples.
+
+Exports are imported on first access, so `import agentkit` (and the
+lightweight `agentkit.entry`) does not pull in LangChain.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "CompiledPromptTemplate": "agentkit.prompts",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module 'agentkit' has no attribute {name!r}")
@@ -0,0 +1,449 @@
+"""Per-request budgets for AgentExecutor runs.
+
+BudgetedAgentExecutor is a drop-in AgentExecutor that caps every run by
+wall-clock time, number of LLM calls and tokens. When a run gets close to
+its budget, or the model repeats a tool call it already made, the loop
+stops and a final answer is forced from the tool results gathered so far.
+Each LLM call only gets the time left before the deadline, so a slow call
+cannot run past it.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from langchain.agents import AgentExecutor
+from langchain.agents.agent_iterator import AgentExecutorIterator
+from langchain_core.agents import AgentAction, AgentFinish, AgentStep
+from langchain_core.callbacks import BaseCallbackHandler, BaseCallbackManager
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables import Runnable, RunnableConfig, ensure_config
+from pydantic import BaseModel, Field, PrivateAttr
+
+from agentkit.prompts import CompiledPromptTemplate
+
+final_answer_prompt = CompiledPromptTemplate(
+    input_variables=["question", "tool_results"],
+    template="""
+    You are out of time for further research. Answer the question below using
+    only these tool results. Say briefly if something could not be checked.
+
+    Question: {question}
+
+    Tool results:
+    {tool_results}
+    """,
+)
+
+
+class RunBudget(BaseModel):
+    max_seconds: Optional[float] = Field(default=60.0, description="Wall-clock deadline per request")
+    max_llm_calls: Optional[int] = Field(default=6, description="LLM round trips per request")
+    max_tokens: Optional[int] = Field(default=20000, description="Total tokens per request")
+    headroom: float = Field(default=0.1, description="Stop once this share of the time/token budget is left")
+    max_repeated_calls: int = Field(default=0, description="Identical tool calls tolerated before stopping")
+
+
+@dataclass
+class BudgetMetrics:
+    runs: int = 0
+    finished: int = 0  # runs where the model answered on its own
+    forced_answers: int = 0  # runs stopped early and answered from tool results
+    llm_calls: int = 0
+    tokens: int = 0
+    exhausted: Dict[str, int] = field(default_factory=dict)  # stop reason -> count
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "finished": self.finished,
+            "forced_answers": self.forced_answers,
+            "llm_calls": self.llm_calls,
+            "tokens": self.tokens,
+            "exhausted": dict(self.exhausted),
+        }
+
+
+class BudgetTracker(BaseCallbackHandler):
+    """Counts LLM calls and tokens for one run and decides when to stop."""
+
+    def __init__(self, budget: RunBudget, question: str = "", reserve_calls: int = 0):
+        self.budget = budget
+        self.question = question
+        self.reserve_calls = reserve_calls
+        self.start = time.perf_counter()
+        self.llm_calls = 0
+        self.tokens = 0
+        self.stop_reason: Optional[str] = None
+        self.tool_calls: Dict[Tuple[str, str], Any] = {}
+        self.repeats = 0
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any) -> None:
+        with self._lock:
+            self.llm_calls += 1
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], **kwargs: Any) -> None:
+        with self._lock:
+            self.llm_calls += 1
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    tokens += usage.get("total_tokens", 0)
+        if not tokens and response.llm_output:
+            tokens = (response.llm_output.get("token_usage") or {}).get("total_tokens", 0)
+        with self._lock:
+            self.tokens += tokens
+
+    def remaining(self, hard: bool = False) -> Optional[float]:
+        """Seconds left before the deadline less headroom (or the deadline itself if `hard`)"""
+        if self.budget.max_seconds is None:
+            return None
+        deadline = self.budget.max_seconds if hard else self.budget.max_seconds * (1 - self.budget.headroom)
+        return max(deadline - self.elapsed, 0.0)
+
+    def check(self) -> Optional[str]:
+        """Return why the run should stop now, or None to keep going"""
+        if self.stop_reason:
+            return self.stop_reason
+
+        budget = self.budget
+        if budget.max_seconds is not None and self.elapsed >= budget.max_seconds * (1 - budget.headroom):
+            self.stop_reason = "deadline"
+        elif budget.max_llm_calls is not None and self.llm_calls >= budget.max_llm_calls - self.reserve_calls:
+            self.stop_reason = "llm_calls"
+        elif budget.max_tokens is not None and self.tokens >= budget.max_tokens * (1 - budget.headroom):
+            self.stop_reason = "tokens"
+        return self.stop_reason
+
+    def can_call_llm(self) -> bool:
+        """Whether one more LLM call still fits in the hard limits"""
+        budget = self.budget
+        return (
+            (budget.max_seconds is None or self.elapsed < budget.max_seconds)
+            and (budget.max_llm_calls is None or self.llm_calls < budget.max_llm_calls)
+            and (budget.max_tokens is None or self.tokens < budget.max_tokens)
+        )
+
+
+# Tracker of the run in progress (per thread / task)
+_tracker: ContextVar[Optional[BudgetTracker]] = ContextVar("budget_tracker", default=None)
+
+
+def _format_tool_results(steps: List[Tuple[AgentAction, Any]]) -> str:
+    if not steps:
+        return "- (no tool results)"
+    return "\n".join(f"- {action.tool}({action.tool_input}): {observation}" for action, observation in steps)
+
+
+class _DeadlineAgent:
+    """Agent proxy: each planning call gets the time left before the deadline"""
+
+    def __init__(self, executor: "BudgetedAgentExecutor", agent: Any, tracker: BudgetTracker):
+        self._executor = executor
+        self._agent = agent
+        self._tracker = tracker
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._agent, name)
+
+    def plan(self, intermediate_steps: list, callbacks: Any = None, **kwargs: Any) -> Any:
+        try:
+            return self._executor._within(
+                self._tracker.remaining(), self._agent.plan, intermediate_steps, callbacks=callbacks, **kwargs
+            )
+        except (TimeoutError, FutureTimeoutError):
+            return self._timed_out()
+
+    async def aplan(self, intermediate_steps: list, callbacks: Any = None, **kwargs: Any) -> Any:
+        try:
+            return await self._executor._awithin(
+                self._tracker.remaining(), self._agent.aplan(intermediate_steps, callbacks=callbacks, **kwargs)
+            )
+        except asyncio.TimeoutError:
+            return self._timed_out()
+
+    def _timed_out(self) -> AgentFinish:
+        # _return() sees the stop reason and forces an answer from the tool results
+        self._tracker.stop_reason = self._tracker.stop_reason or "deadline"
+        return AgentFinish(return_values={"output": ""}, log="Stopped early: deadline")
+
+
+class _BudgetedIterator(AgentExecutorIterator):
+    """AgentExecutorIterator that runs each pass under its own BudgetTracker"""
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        tracker, config = self.agent_executor._start_run(self.inputs, {"callbacks": self.callbacks})
+        callbacks, self.callbacks = self.callbacks, config["callbacks"]
+        try:
+            yield from self.agent_executor._tracked(tracker, super().__iter__())
+        finally:
+            self.callbacks = callbacks
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        tracker, config = self.agent_executor._start_run(self.inputs, {"callbacks": self.callbacks})
+        callbacks, self.callbacks = self.callbacks, config["callbacks"]
+        try:
+            async for step in self.agent_executor._atracked(tracker, super().__aiter__()):
+                yield step
+        finally:
+            self.callbacks = callbacks
+
+
+class BudgetedAgentExecutor(AgentExecutor):
+    """AgentExecutor with a per-request time, LLM-call and token budget.
+
+    If `final_answer_llm` is set, one LLM call is kept in reserve to write
+    the forced answer; otherwise the tool results are returned as-is.
+    """
+
+    budget: RunBudget = Field(default_factory=RunBudget)
+    final_answer_llm: Optional[Runnable] = None
+
+    _metrics: BudgetMetrics = PrivateAttr(default_factory=BudgetMetrics)
+    _metrics_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    # Runs sync LLM calls that have a deadline, so the run can stop waiting for them
+    _pool: ThreadPoolExecutor = PrivateAttr(default_factory=lambda: ThreadPoolExecutor(thread_name_prefix="budget"))
+
+    @property
+    def budget_metrics(self) -> BudgetMetrics:
+        return self._metrics
+
+    def _start_run(
+        self, input: Dict[str, Any], config: Optional[RunnableConfig]
+    ) -> Tuple[BudgetTracker, RunnableConfig]:
+        tracker = BudgetTracker(
+            self.budget,
+            question=str(input.get("input", "")),
+            reserve_calls=int(self.final_answer_llm is not None),
+        )
+        config = ensure_config(config)
+        callbacks = config.get("callbacks")
+        if isinstance(callbacks, BaseCallbackManager):
+            callbacks = callbacks.copy()
+            callbacks.add_handler(tracker, inherit=True)
+        else:
+            callbacks = [*(callbacks or []), tracker]
+        return tracker, {**config, "callbacks": callbacks}
+
+    def _finish_run(self, tracker: BudgetTracker, forced: bool) -> None:
+        with self._metrics_lock:
+            metrics = self._metrics
+            metrics.runs += 1
+            metrics.llm_calls += tracker.llm_calls
+            metrics.tokens += tracker.tokens
+            if forced:
+                metrics.forced_answers += 1
+                metrics.exhausted[tracker.stop_reason] = metrics.exhausted.get(tracker.stop_reason, 0) + 1
+            else:
+                metrics.finished += 1
+
+    def invoke(self, input: Dict[str, Any], config: Optional[RunnableConfig] = None, **kwargs: Any) -> Dict[str, Any]:
+        tracker, config = self._start_run(input, config)
+        token = _tracker.set(tracker)
+        try:
+            return super().invoke(input, config, **kwargs)
+        finally:
+            _tracker.reset(token)
+            self._finish_run(tracker, forced=tracker.stop_reason is not None)
+
+    async def ainvoke(
+        self, input: Dict[str, Any], config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Dict[str, Any]:
+        tracker, config = self._start_run(input, config)
+        token = _tracker.set(tracker)
+        try:
+            return await super().ainvoke(input, config, **kwargs)
+        finally:
+            _tracker.reset(token)
+            self._finish_run(tracker, forced=tracker.stop_reason is not None)
+
+    @property
+    def _action_agent(self) -> Any:
+        agent = super()._action_agent
+        tracker = _tracker.get()
+        if tracker is None or tracker.budget.max_seconds is None:
+            return agent
+        return _DeadlineAgent(self, agent, tracker)
+
+    def _within(self, seconds: Optional[float], call: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """call(*args, **kwargs), giving up after `seconds` (the call itself keeps running in the pool)"""
+        if seconds is None:
+            return call(*args, **kwargs)
+        context = contextvars.copy_context()
+        return self._pool.submit(context.run, call, *args, **kwargs).result(timeout=seconds)
+
+    @staticmethod
+    async def _awithin(seconds: Optional[float], call: Awaitable[Any]) -> Any:
+        return await asyncio.wait_for(call, seconds)
+
+    # stream(), astream() and iter() go through AgentExecutorIterator, not invoke()
+
+    def _tracked(self, tracker: BudgetTracker, steps: Iterator[Any]) -> Iterator[Any]:
+        """Yield from `steps` with the tracker active while each step runs"""
+        try:
+            while True:
+                token = _tracker.set(tracker)
+                try:
+                    step = next(steps)
+                except StopIteration:
+                    return
+                finally:
+                    _tracker.reset(token)
+                yield step
+        finally:
+            steps.close()
+            self._finish_run(tracker, forced=tracker.stop_reason is not None)
+
+    async def _atracked(self, tracker: BudgetTracker, steps: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        try:
+            while True:
+                token = _tracker.set(tracker)
+                try:
+                    step = await steps.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    _tracker.reset(token)
+                yield step
+        finally:
+            await steps.aclose()
+            self._finish_run(tracker, forced=tracker.stop_reason is not None)
+
+    def stream(
+        self, input: Dict[str, Any], config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Iterator[Dict[str, Any]]:
+        tracker, config = self._start_run(input, config)
+        yield from self._tracked(tracker, super().stream(input, config, **kwargs))
+
+    async def astream(
+        self, input: Dict[str, Any], config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> AsyncIterator[Dict[str, Any]]:
+        tracker, config = self._start_run(input, config)
+        async for step in self._atracked(tracker, super().astream(input, config, **kwargs)):
+            yield step
+
+    def iter(
+        self, inputs: Any, callbacks: Any = None, *, include_run_info: bool = False, **kwargs: Any
+    ) -> AgentExecutorIterator:
+        return _BudgetedIterator(self, inputs, callbacks, tags=self.tags, include_run_info=include_run_info)
+
+    def _should_continue(self, iterations: int, time_elapsed: float) -> bool:
+        tracker = _tracker.get()
+        if tracker is not None and tracker.check():
+            return False
+        if super()._should_continue(iterations, time_elapsed):
+            return True
+        # The executor's own limits: force an answer from tool results as well
+        if tracker is not None:
+            if self.max_iterations is not None and iterations >= self.max_iterations:
+                tracker.stop_reason = "max_iterations"
+            else:
+                tracker.stop_reason = "max_execution_time"
+        return False
+
+    def _repeated_step(self, agent_action: AgentAction) -> Optional[AgentStep]:
+        """Answer a repeated tool call from the first result instead of running it again"""
+        tracker = _tracker.get()
+        if tracker is None:
+            return None
+        key = (agent_action.tool, repr(agent_action.tool_input))
+        if key not in tracker.tool_calls:
+            return None
+        tracker.repeats += 1
+        if tracker.repeats > tracker.budget.max_repeated_calls:
+            tracker.stop_reason = tracker.stop_reason or "repeated_tool_call"
+        return AgentStep(action=agent_action, observation=tracker.tool_calls[key])
+
+    def _remember_step(self, step: AgentStep) -> AgentStep:
+        tracker = _tracker.get()
+        if tracker is not None:
+            tracker.tool_calls[(step.action.tool, repr(step.action.tool_input))] = step.observation
+        return step
+
+    def _perform_agent_action(self, name_to_tool_map, color_mapping, agent_action, run_manager=None) -> AgentStep:
+        repeated = self._repeated_step(agent_action)
+        if repeated is not None:
+            return repeated
+        step = super()._perform_agent_action(name_to_tool_map, color_mapping, agent_action, run_manager)
+        return self._remember_step(step)
+
+    async def _aperform_agent_action(
+        self, name_to_tool_map, color_mapping, agent_action, run_manager=None
+    ) -> AgentStep:
+        repeated = self._repeated_step(agent_action)
+        if repeated is not None:
+            return repeated
+        step = await super()._aperform_agent_action(name_to_tool_map, color_mapping, agent_action, run_manager)
+        return self._remember_step(step)
+
+    def _final_answer_prompt(self, tracker: BudgetTracker, intermediate_steps: list) -> Optional[str]:
+        if self.final_answer_llm is None or not tracker.can_call_llm():
+            return None
+        return final_answer_prompt.format(
+            question=tracker.question, tool_results=_format_tool_results(intermediate_steps)
+        )
+
+    @staticmethod
+    def _final_answer_callbacks(tracker: BudgetTracker, run_manager) -> Any:
+        """Child of the run's callbacks (tracing, verbose output), with the tracker on it"""
+        if run_manager is None:
+            return [tracker]
+        callbacks = run_manager.get_child()
+        if tracker not in callbacks.handlers:
+            callbacks.add_handler(tracker, inherit=True)
+        return callbacks
+
+    def _stopped_finish(self, tracker: BudgetTracker, intermediate_steps: list, answer: Any) -> AgentFinish:
+        answer = getattr(answer, "content", answer)
+        if not isinstance(answer, str) or not answer.strip():
+            answer = f"I had to stop early. Here is what I found:\n{_format_tool_results(intermediate_steps)}"
+        return AgentFinish(return_values={"output": answer}, log=f"Stopped early: {tracker.stop_reason}")
+
+    def _return(self, output: AgentFinish, intermediate_steps: list, run_manager=None) -> Dict[str, Any]:
+        tracker = _tracker.get()
+        if tracker is not None and tracker.stop_reason:
+            prompt = self._final_answer_prompt(tracker, intermediate_steps)
+            answer = None
+            if prompt is not None:
+                callbacks = self._final_answer_callbacks(tracker, run_manager)
+                try:
+                    answer = self._within(
+                        tracker.remaining(hard=True),
+                        self.final_answer_llm.invoke, prompt, config={"callbacks": callbacks},
+                    )
+                except (TimeoutError, FutureTimeoutError):
+                    pass
+            output = self._stopped_finish(tracker, intermediate_steps, answer)
+        return super()._return(output, intermediate_steps, run_manager)
+
+    async def _areturn(self, output: AgentFinish, intermediate_steps: list, run_manager=None) -> Dict[str, Any]:
+        tracker = _tracker.get()
+        if tracker is not None and tracker.stop_reason:
+            prompt = self._final_answer_prompt(tracker, intermediate_steps)
+            answer = None
+            if prompt is not None:
+                callbacks = self._final_answer_callbacks(tracker, run_manager)
+                try:
+                    answer = await self._awithin(
+                        tracker.remaining(hard=True),
+                        self.final_answer_llm.ainvoke(prompt, config={"callbacks": callbacks}),
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            output = self._stopped_finish(tracker, intermediate_steps, answer)
+        return await super()._areturn(output, intermediate_steps, run_manager)
@@ -0,0 +1,109 @@
+"""Lazy entry point for serving the example chains and agents.
+
+Importing this module costs a few milliseconds: LangChain, the Gemini
+client and the example scripts are only loaded when a component is first
+requested, and each component is built once per process. That keeps the
+cold start of a short-lived worker down to the component it actually
+serves.
+
+    from agentkit.entry import handler
+    handler({"component": "linkedin_chain",
+             "input": {"rough_idea": "...", "target_audience": "..."}})
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from agentkit.examples import load_example
+
+Serve = Callable[[Dict[str, Any]], Any]
+
+
+@dataclass(frozen=True)
+class Component:
+    script: str
+    # (module, llm) -> function serving one request; llm=None means Gemini
+    build: Callable[[Any, Any], Serve]
+
+
+def _resume_analyzer(module, llm) -> Serve:
+    agent = module.ResumeAnalyzerAgent(llm)
+    return lambda request: agent.analyze(request["resume_text"], request["job_role"])
+
+
+def _job_application(module, llm) -> Serve:
+    assistant = module.JobApplicationAssistant(llm)
+
+    def serve(request):
+        analysis = assistant.analyze_job(request["job_posting"])
+        return {
+            "analysis": analysis,
+            "cover_letter": assistant.generate_cover_letter(analysis, request["candidate_background"]),
+            "interview_prep": assistant.prepare_interview(analysis),
+        }
+
+    return serve
+
+
+def _travel_agent(module, llm) -> Serve:
+    executor = module.build_travel_executor(llm)
+    return lambda request: module.prefetcher.invoke(executor, request)
+
+
+COMPONENTS: Dict[str, Component] = {
+    "linkedin_chain": Component(
+        "Day 2/3-linkedIn-post-optimizer.py", lambda module, llm: module.build_linkedin_chain(llm).invoke
+    ),
+    "resume_analyzer": Component("Day 2/4-resume-analyzer.py", _resume_analyzer),
+    "business_analyzer": Component(
+        "Day 3/2-chain-of-thought.py", lambda module, llm: module.build_business_analyzer(llm).invoke
+    ),
+    "competitor_analyzer": Component(
+        "Day 3/3-structured-output-with-pydantic.py", lambda module, llm: module.build_competitor_analyzer(llm).invoke
+    ),
+    "job_application": Component("Day 3/4-smart-job-application-assistant.py", _job_application),
+    "tool_agent": Component(
+        "Day 4/1-tool-calling-usage.py", lambda module, llm: module.build_agent_executor(llm).invoke
+    ),
+    "travel_agent": Component("Day 4/2-travel-agent.py", _travel_agent),
+}
+
+_built: Dict[str, Serve] = {}
+_lock = threading.Lock()
+
+
+def get_component(name: str, llm=None) -> Serve:
+    """Build a component on first use; later calls with llm=None reuse it"""
+    if name not in COMPONENTS:
+        raise KeyError(f"Unknown component {name!r}, expected one of {sorted(COMPONENTS)}")
+    if llm is None and name in _built:
+        return _built[name]
+
+    component = COMPONENTS[name]
+    with _lock:
+        if llm is None and name in _built:
+            return _built[name]
+        serve = component.build(load_example(component.script), llm)
+        if llm is None:
+            _built[name] = serve
+    return serve
+
+
+def _jsonable(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if hasattr(value, "content"):
+        return value.content
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+def handler(event: Dict[str, Any], context: Optional[Any] = None) -> Dict[str, Any]:
+    """Serverless-style handler: {"component": name, "input": {...}} -> {"component", "output"}"""
+    name = event["component"]
+    output = get_component(name)(event.get("input", {}))
+    return {"component": name, "output": _jsonable(output)}
@@ -0,0 +1,25 @@
+"""Load the day-by-day example scripts as modules.
+
+The scripts live in folders with spaces and start with digits, so they
+cannot be imported by name. Their demo code sits under `__main__`, so
+loading them only defines the prompts, tools and builder functions.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_example(relative_path):
+    """Import an example script, e.g. load_example("Day 4/2-travel-agent.py")"""
+    path = ROOT / relative_path
+    name = "example_" + path.stem.replace("-", "_")
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
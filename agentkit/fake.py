@@ -0,0 +1,213 @@
+"""Offline chat models for benchmarks and simulations."""
+
+import asyncio
+import itertools
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable
+from pydantic import ConfigDict, Field, PrivateAttr
+
+LATENCY_DISTRIBUTIONS = ["constant", "lognormal", "heavy_tailed"]
+
+
+def latency_sampler(
+    kind: str = "lognormal",
+    median: float = 0.05,
+    sigma: float = 0.25,
+    tail_share: float = 0.05,
+    tail_alpha: float = 1.3,
+    seed: Optional[int] = None,
+) -> Callable[[], float]:
+    """Return a zero-argument callable drawing one latency (seconds) per call.
+
+    - constant: always `median`
+    - lognormal: lognormal around `median` with shape `sigma`
+    - heavy_tailed: lognormal body, Pareto(`tail_alpha`) tail for `tail_share` of calls
+    """
+    rng = random.Random(seed)
+
+    if kind == "constant":
+        return lambda: median
+    if kind == "lognormal":
+        return lambda: median * rng.lognormvariate(0, sigma)
+    if kind == "heavy_tailed":
+        def sample() -> float:
+            if rng.random() < tail_share:
+                return median * rng.paretovariate(tail_alpha) * 3
+            return median * rng.lognormvariate(0, sigma)
+        return sample
+    raise ValueError(f"Unknown latency distribution {kind!r}, expected one of {LATENCY_DISTRIBUTIONS}")
+
+
+def record_to_message(record: Dict[str, Any]) -> AIMessage:
+    """Build an AIMessage from a recording entry's "message" dict"""
+    tool_calls = [
+        {"name": call["name"], "args": call.get("args", {}), "id": call.get("id", f"call_{i}"), "type": "tool_call"}
+        for i, call in enumerate(record.get("tool_calls", []))
+    ]
+    usage = record.get("usage")
+    if usage:
+        usage = {**usage, "total_tokens": usage.get("input_tokens", 0) + usage.get("output_tokens", 0)}
+    return AIMessage(content=record.get("content", ""), tool_calls=tool_calls, usage_metadata=usage)
+
+
+def message_to_record(message: BaseMessage) -> Dict[str, Any]:
+    """Inverse of record_to_message"""
+    record: Dict[str, Any] = {"content": message.content}
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        record["tool_calls"] = [{"name": call["name"], "args": call["args"]} for call in tool_calls]
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        record["usage"] = {"input_tokens": usage["input_tokens"], "output_tokens": usage["output_tokens"]}
+    return record
+
+
+def _prompt_text(messages: List[BaseMessage]) -> str:
+    return "\n".join(message.content for message in messages if isinstance(message.content, str))
+
+
+def _turn(messages: List[BaseMessage]) -> int:
+    """Number of model turns already in the conversation"""
+    return sum(isinstance(message, AIMessage) for message in messages)
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model that replays scripted AIMessages after a simulated delay.
+
+    Responses are returned in order (wrapping around), so a list like
+    [tool-call message, final answer] drives one AgentExecutor run.
+    `latency` is either a fixed number of seconds or a zero-argument
+    callable that draws one per call (see latency_sampler).
+    """
+
+    responses: List[AIMessage]
+    latency: Union[float, Callable[[], float]] = 0.0
+
+    _calls: Any = PrivateAttr(default_factory=itertools.count)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _delay(self) -> float:
+        return self.latency() if callable(self.latency) else self.latency
+
+    def _pick(self, messages: List[BaseMessage]) -> AIMessage:
+        return self.responses[next(self._calls) % len(self.responses)]
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        delay = self._delay()
+        if delay > 0:
+            time.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=self._pick(messages))])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        # asyncio.sleep so a cancelled call really stops
+        delay = self._delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=self._pick(messages))])
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "ScriptedChatModel":
+        # Tool calls are already in the script
+        return self
+
+
+class ReplayChatModel(ScriptedChatModel):
+    """Replays recorded responses, picking the one that fits the prompt.
+
+    A recording file is a JSON list of entries:
+
+        {"match": "visit Japan", "turn": 0, "message": {"content": "", "tool_calls": [...]}}
+
+    `match` is a substring of the prompt and `turn` the number of model
+    turns already in the conversation; both are optional. Entries that fit
+    equally well are served round-robin, so concurrent callers of different
+    chains each get their own kind of response.
+    """
+
+    recordings: List[Dict[str, Any]]
+    responses: List[AIMessage] = Field(default_factory=list)
+
+    _messages: List[AIMessage] = PrivateAttr(default_factory=list)
+
+    def model_post_init(self, context: Any) -> None:
+        super().model_post_init(context)
+        self._messages = [record_to_message(entry["message"]) for entry in self.recordings]
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], **kwargs: Any) -> "ReplayChatModel":
+        return cls(recordings=json.loads(Path(path).read_text(encoding="utf-8")), **kwargs)
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    def _pick(self, messages: List[BaseMessage]) -> AIMessage:
+        text = _prompt_text(messages)
+        turn = _turn(messages)
+        candidates = [
+            index
+            for index, entry in enumerate(self.recordings)
+            if entry.get("match", "") in text and entry.get("turn", turn) == turn
+        ]
+        if not candidates:
+            raise ValueError(f"No recorded response matches this prompt (turn {turn}): {text[:200]!r}")
+        return self._messages[candidates[next(self._calls) % len(candidates)]]
+
+
+class RecordingChatModel(BaseChatModel):
+    """Passes calls through to a real model and keeps what it answered.
+
+    Use it in place of the real model for a run, then `save()` to get a
+    recording file for ReplayChatModel. Entries carry `turn`; add `match`
+    strings by hand where several prompts share a model.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model: Runnable
+    entries: List[Dict[str, Any]] = Field(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "recording"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self.model.invoke(messages, stop=stop, **kwargs)
+        self.entries.append({"turn": _turn(messages), "message": message_to_record(message)})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "RecordingChatModel":
+        # model_copy skips validation, so the copy appends to this same entries list
+        return self.model_copy(update={"model": self.model.bind_tools(tools, **kwargs)})
+
+    def save(self, path: Union[str, Path]) -> None:
+        Path(path).write_text(json.dumps(self.entries, indent=2, ensure_ascii=False), encoding="utf-8")
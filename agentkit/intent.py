@@ -0,0 +1,100 @@
+"""Lightweight local intent/entity extraction for travel queries.
+
+No LLM involved: a handful of regexes pull out the destination, month,
+passport country and money amounts so likely tool calls can be started
+before the model has even answered.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+MONTHS = [
+    "january", "february", "march", "april", "may", "june", "july",
+    "august", "september", "october", "november", "december",
+]
+
+# Words and symbols that map to a currency code
+CURRENCIES = {
+    "$": "USD", "usd": "USD", "dollar": "USD", "dollars": "USD", "us dollars": "USD",
+    "€": "EUR", "eur": "EUR", "euro": "EUR", "euros": "EUR",
+    "¥": "JPY", "jpy": "JPY", "yen": "JPY", "japanese yen": "JPY",
+    "£": "GBP", "gbp": "GBP", "pound": "GBP", "pounds": "GBP",
+}
+
+# Nationalities people use instead of the passport country
+NATIONALITIES = {
+    "american": "US", "british": "UK", "indian": "India", "japanese": "Japan",
+}
+
+_CURRENCY_WORDS = "|".join(
+    sorted((re.escape(word) for word in CURRENCIES if word.isalpha() or " " in word), key=len, reverse=True)
+)
+_PLACE = r"([A-Z][A-Za-z]+(?:\s[A-Z][A-Za-z]+)?)"
+
+_DESTINATION = re.compile(r"\b(?:visit|visiting|to|in|for|around)\s+(?:the\s+)?" + _PLACE)
+_PASSPORT = [
+    re.compile(r"\b(?:I'm|I am|we're|we are)\s+from\s+(?:the\s+)?" + _PLACE),
+    re.compile(_PLACE + r"\s+(?:citizens?|passport|nationals?)\b"),
+    re.compile(r"\b(?:an?\s+)?(" + "|".join(NATIONALITIES) + r")\s+(?:citizen|traveller|traveler)\b", re.I),
+]
+_AMOUNT_SYMBOL = re.compile(r"([$€£¥])\s?(\d[\d,]*(?:\.\d+)?)")
+_AMOUNT_WORD = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s?(" + _CURRENCY_WORDS + r")\b", re.I)
+_TARGET_CURRENCY = re.compile(r"\b(?:to|into|in)\s+(" + _CURRENCY_WORDS + r")\b", re.I)
+
+
+class TravelIntent(BaseModel):
+    destination: Optional[str] = Field(default=None, description="Country or city the user wants to go to")
+    month: Optional[str] = Field(default=None, description="Month of travel, capitalised")
+    passport: Optional[str] = Field(default=None, description="Passport country, e.g. 'US'")
+    amounts: List[Tuple[float, str]] = Field(default_factory=list, description="(amount, currency code) pairs")
+    target_currency: Optional[str] = Field(default=None, description="Currency the user wants to convert into")
+    keywords: List[str] = Field(default_factory=list, description="Lower-cased words of the query")
+
+
+def _is_currency(text: str) -> bool:
+    return text.lower() in CURRENCIES
+
+
+def _is_month(text: str) -> bool:
+    return text.lower() in MONTHS
+
+
+def extract_travel_intent(query: str) -> TravelIntent:
+    """Pull travel entities out of a free-text query"""
+    intent = TravelIntent(keywords=re.findall(r"[a-z]+", query.lower()))
+
+    for word in intent.keywords:
+        # "may" is only a month when it is capitalised
+        if word in MONTHS and (word != "may" or "May" in query):
+            intent.month = word.capitalize()
+            break
+
+    for pattern in _PASSPORT:
+        match = pattern.search(query)
+        if match:
+            passport = match.group(1)
+            intent.passport = NATIONALITIES.get(passport.lower(), passport)
+            break
+
+    for match in _DESTINATION.finditer(query):
+        place = match.group(1)
+        if _is_month(place) or _is_currency(place) or place == intent.passport:
+            continue
+        # "Japanese Yen" style matches are currencies, not places
+        if _is_currency(place.split()[-1]):
+            continue
+        intent.destination = place
+        break
+
+    for symbol, amount in _AMOUNT_SYMBOL.findall(query):
+        intent.amounts.append((float(amount.replace(",", "")), CURRENCIES[symbol]))
+    for amount, word in _AMOUNT_WORD.findall(query):
+        intent.amounts.append((float(amount.replace(",", "")), CURRENCIES[word.lower()]))
+
+    match = _TARGET_CURRENCY.search(query)
+    if match:
+        intent.target_currency = CURRENCIES[match.group(1).lower()]
+
+    return intent
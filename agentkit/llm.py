@@ -0,0 +1,18 @@
+"""Default Gemini chat model for the examples."""
+
+import os
+
+DEFAULT_MODEL = "gemini-2.0-flash-lite"
+# Second tier for HedgedChatModel: low-priority calls and failover
+FALLBACK_MODEL = "gemini-2.5-flash-lite"
+
+
+def get_llm(model: str = DEFAULT_MODEL, **kwargs):
+    """Build a Gemini chat model, reading GOOGLE_API_KEY from .env"""
+    # The Google client takes longer to import than everything else here,
+    # so only pay for it when a model is actually needed
+    from dotenv import load_dotenv
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    load_dotenv()
+    return ChatGoogleGenerativeAI(model=model, google_api_key=os.getenv("GOOGLE_API_KEY"), **kwargs)
@@ -0,0 +1,285 @@
+"""Process-pool stage for parsing and validating LLM completions.
+
+Pydantic validation, regex parsing and output formatting are CPU work. Done
+inline they hold the GIL and stall the event loop that drives the LLM
+calls. ParseStage moves them to a process pool:
+
+- completions are queued and handed to the workers in batches, as raw
+  strings, so each round trip amortises the pickling and IPC cost
+- the queue is bounded: once `max_pending` completions wait for parsing,
+  `submit()` blocks. Call it while still holding the network stage's
+  concurrency slot, and await the returned future after releasing it.
+  A full queue then stops new LLM calls from starting (backpressure).
+  `parse()` and `as_runnable()` block only the caller, so on their own
+  they do not slow the network stage down.
+
+What to do with a completion is a ParseSpec of "module:name" or
+"Day 3/3-....py:name" references, so a worker can import it by itself.
+
+    async with ParseStage(workers=2) as stage:
+        async with llm_slots:
+            message = await llm.ainvoke(prompt)
+            parsed = await stage.submit(COMPETITOR_PARSE, message.content)
+        analysis = await parsed
+
+    chain = prompt | llm | StrOutputParser() | stage.as_runnable(COMPETITOR_PARSE)
+"""
+
+import asyncio
+import importlib
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from agentkit.examples import load_example
+
+
+@dataclass(frozen=True)
+class ParseSpec:
+    """How to turn one kind of completion into a result.
+
+    - `model`: Pydantic model validated with PydanticOutputParser
+    - `parser`: callable(text) -> value, used instead of `model`
+    - `formatter`: callable(value) -> str applied to the parsed value
+    """
+
+    model: Optional[str] = None
+    parser: Optional[str] = None
+    formatter: Optional[str] = None
+
+
+@dataclass
+class ParseStats:
+    items: int = 0
+    batches: int = 0
+    errors: int = 0
+    blocked: int = 0  # submit() calls that waited for room in the queue
+    blocked_seconds: float = 0.0
+
+    @property
+    def mean_batch(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+
+_resolved: Dict[str, Any] = {}
+
+
+def resolve(reference: str) -> Any:
+    """Import "package.module:name" or "Day 3/3-script.py:name" (cached per process)"""
+    if reference not in _resolved:
+        module_name, _, attr = reference.rpartition(":")
+        if module_name.endswith(".py"):
+            module = load_example(module_name)
+        else:
+            module = importlib.import_module(module_name)
+        _resolved[reference] = getattr(module, attr)
+    return _resolved[reference]
+
+
+_parsers: Dict[ParseSpec, Callable[[str], Any]] = {}
+
+
+def _parser_for(spec: ParseSpec) -> Callable[[str], Any]:
+    if spec not in _parsers:
+        if spec.parser:
+            parse = resolve(spec.parser)
+        elif spec.model:
+            from langchain_core.output_parsers import PydanticOutputParser
+
+            parse = PydanticOutputParser(pydantic_object=resolve(spec.model)).parse
+        else:
+            raise ValueError("ParseSpec needs a model or a parser")
+        if spec.formatter:
+            formatter = resolve(spec.formatter)
+            _parsers[spec] = lambda text, parse=parse: formatter(parse(text))
+        else:
+            _parsers[spec] = parse
+    return _parsers[spec]
+
+
+def run_spec(spec: ParseSpec, text: str) -> Any:
+    """Parse (and format) one completion in this process"""
+    return _parser_for(spec)(text)
+
+
+def _run_batch(batch: List[Tuple[ParseSpec, str]]) -> List[Tuple[bool, Any]]:
+    """Worker entry point: (True, result) or (False, (error type name, message)) per item"""
+    results = []
+    for spec, text in batch:
+        try:
+            results.append((True, run_spec(spec, text)))
+        except Exception as error:
+            # Exceptions with custom __init__ (e.g. OutputParserException) don't always unpickle
+            results.append((False, (type(error).__name__, str(error))))
+    return results
+
+
+def _parse_error(name: str, message: str, text: str) -> Exception:
+    """OutputParserException for an item that failed in a worker, as PydanticOutputParser raises inline"""
+    from langchain_core.exceptions import OutputParserException
+
+    if name == "OutputParserException":
+        # Not a str, so LangChain does not append its troubleshooting link a second time
+        return OutputParserException(ValueError(message), llm_output=text)
+    return OutputParserException(f"{name}: {message}", llm_output=text)
+
+
+def _preload(specs: Sequence[ParseSpec]) -> None:
+    for spec in specs:
+        _parser_for(spec)
+
+
+class ParseStage:
+    """Batched, bounded hand-off of completions to a process pool.
+
+    `workers=0` parses inline on the event loop (the baseline to compare
+    against). `preload` specs are imported in every worker at start-up so
+    the first batch does not pay for it.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        batch_size: int = 16,
+        max_delay: float = 0.002,
+        max_pending: int = 256,
+        preload: Sequence[ParseSpec] = (),
+        executor: Optional[Executor] = None,
+    ):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.preload = tuple(preload)
+        self.stats = ParseStats()
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self._batches: set = set()
+
+    async def start(self) -> "ParseStage":
+        if self.workers and self._executor is None:
+            # spawn: the caller usually has threads running (hedging, prefetch), which fork does not mix with
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_preload,
+                initargs=(self.preload,),
+            )
+            # Start the workers now rather than on the first batch
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(loop.run_in_executor(self._executor, _run_batch, []) for _ in range(self.workers)))
+        if self.workers:
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            # Two batches per worker: one running, one waiting, so workers never idle on IPC
+            self._in_flight = asyncio.Semaphore(2 * self.workers)
+            self._batcher = asyncio.create_task(self._batch_loop())
+        return self
+
+    async def close(self) -> None:
+        if self._batcher is not None:
+            await self._queue.join()
+            self._batcher.cancel()
+            await asyncio.gather(self._batcher, *self._batches, return_exceptions=True)
+            self._batcher = None
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def __aenter__(self) -> "ParseStage":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def submit(self, spec: ParseSpec, text: str) -> "asyncio.Future":
+        """Queue a completion; waits while the queue is full. Returns a future for the result"""
+        future = asyncio.get_running_loop().create_future()
+        if not self.workers:
+            self.stats.items += 1
+            try:
+                future.set_result(run_spec(spec, text))
+            except Exception as error:
+                self.stats.errors += 1
+                future.set_exception(error)
+            return future
+
+        if self._queue is None:
+            raise RuntimeError("ParseStage is not started; use `async with ParseStage(...)`")
+        # Import the references here too, so the results the workers send back can be unpickled
+        for reference in (spec.model, spec.parser):
+            if reference:
+                resolve(reference)
+        if self._queue.full():
+            self.stats.blocked += 1
+            start = time.perf_counter()
+            await self._queue.put((spec, text, future))
+            self.stats.blocked_seconds += time.perf_counter() - start
+        else:
+            self._queue.put_nowait((spec, text, future))
+        return future
+
+    async def parse(self, spec: ParseSpec, text: str) -> Any:
+        """Parse one completion and wait for the result"""
+        return await (await self.submit(spec, text))
+
+    def as_runnable(self, spec: ParseSpec):
+        """Chain step: parses in the pool on ainvoke/abatch, inline on invoke"""
+        from langchain_core.runnables import RunnableLambda
+
+        async def aparse(text: str) -> Any:
+            return await self.parse(spec, text)
+
+        return RunnableLambda(lambda text: run_spec(spec, text), afunc=aparse, name="ParseStage")
+
+    async def _batch_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._in_flight.acquire()
+            task = asyncio.create_task(self._run(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run(self, batch: List[Tuple[ParseSpec, str, asyncio.Future]]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self._executor, _run_batch, [(spec, text) for spec, text, _ in batch])
+        except Exception as error:
+            # The pool itself failed (e.g. a worker died): every item gets that error
+            results = [(False, error)] * len(batch)
+        finally:
+            self._in_flight.release()
+
+        self.stats.batches += 1
+        self.stats.items += len(batch)
+        for (_, text, future), (ok, value) in zip(batch, results):
+            if not ok:
+                self.stats.errors += 1
+            if not future.done():
+                if ok:
+                    future.set_result(value)
+                elif isinstance(value, Exception):
+                    future.set_exception(value)
+                else:
+                    future.set_exception(_parse_error(*value, text))
+            self._queue.task_done()
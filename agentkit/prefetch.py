@@ -0,0 +1,145 @@
+"""Speculative tool prefetching for AgentExecutor runs.
+
+While the first LLM turn is in flight, the calls the model is most likely
+to make are already running in a thread pool. When the agent then asks for
+the same call, the prefetched result is served; anything the model never
+asks for is dropped when the run ends.
+"""
+
+import functools
+import inspect
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from langchain_core.tools import BaseTool
+
+# (tool name, tool arguments) as predicted from the user query
+PredictedCall = Tuple[str, Dict[str, Any]]
+CallKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+# Prefetched futures of the run in progress (per thread / task)
+_session: ContextVar[Optional[Dict[CallKey, Future]]] = ContextVar("prefetch_session", default=None)
+
+
+@dataclass
+class PrefetchStats:
+    runs: int = 0
+    prefetched: int = 0  # speculative calls started
+    hits: int = 0  # tool calls served from a prefetch
+    misses: int = 0  # tool calls the predictor did not see coming
+    wasted: int = 0  # speculative calls the model never asked for
+    queued: int = 0  # predicted calls still waiting for a worker when asked for (counted as misses)
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of the model's tool calls that were served from a prefetch"""
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+    @property
+    def precision(self) -> float:
+        """Share of speculative calls that turned out to be useful"""
+        return self.hits / self.prefetched if self.prefetched else 0.0
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.strip().lower()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+class ToolPrefetcher:
+    """Wrap tools so speculative results can be served to an AgentExecutor.
+
+    Build the executor with `prefetcher.tools` and run it through
+    `prefetcher.invoke(executor, inputs)`.
+    """
+
+    def __init__(
+        self,
+        tools: Iterable[BaseTool],
+        predict: Callable[[str], List[PredictedCall]],
+        max_workers: int = 4,
+    ):
+        self.predict = predict
+        self.stats = PrefetchStats()
+        self._funcs: Dict[str, Callable[..., Any]] = {}
+        self._signatures: Dict[str, inspect.Signature] = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+
+        self.tools: List[BaseTool] = []
+        for tool in tools:
+            self._funcs[tool.name] = tool.func
+            self._signatures[tool.name] = inspect.signature(tool.func)
+            self.tools.append(tool.model_copy(update={"func": self._wrap(tool.name, tool.func)}))
+
+    def _key(self, name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> CallKey:
+        bound = self._signatures[name].bind(*args, **kwargs)
+        bound.apply_defaults()
+        return name, tuple((arg, _normalize(value)) for arg, value in bound.arguments.items())
+
+    def _record(self, **counts: int) -> None:
+        with self._lock:
+            for field, count in counts.items():
+                setattr(self.stats, field, getattr(self.stats, field) + count)
+
+    def _wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            session = _session.get()
+            if session is not None:
+                try:
+                    key = self._key(name, args, kwargs)
+                except TypeError:
+                    # Let the tool raise its own error for bad arguments
+                    return func(*args, **kwargs)
+                future = session.pop(key, None)
+                if future is not None:
+                    if not future.cancel():
+                        self._record(hits=1)
+                        return future.result()
+                    # Still queued behind other runs' prefetches: running it here is faster than waiting
+                    self._record(misses=1, queued=1)
+                else:
+                    self._record(misses=1)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    def prefetch(self, query: str) -> Dict[CallKey, Future]:
+        """Start the predicted tool calls for a query"""
+        session: Dict[CallKey, Future] = {}
+        for name, kwargs in self.predict(query):
+            if name not in self._funcs:
+                continue
+            try:
+                key = self._key(name, (), kwargs)
+            except TypeError:
+                # Predictor produced arguments the tool does not take
+                continue
+            if key not in session:
+                session[key] = self._pool.submit(self._funcs[name], **kwargs)
+        self._record(prefetched=len(session))
+        return session
+
+    def invoke(self, executor: Any, inputs: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        """Run the executor with speculative tool calls started up front"""
+        session = self.prefetch(inputs["input"])
+        token = _session.set(session)
+        try:
+            return executor.invoke(inputs, **kwargs)
+        finally:
+            _session.reset(token)
+            # Whatever is left was never asked for: drop it
+            for future in session.values():
+                future.cancel()
+            self._record(runs=1, wasted=len(session))
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,116 @@
+"""Pre-compiled prompt templates for hot render paths."""
+
+import textwrap
+from string import Formatter
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+from langchain_core.prompts import PromptTemplate
+from pydantic import PrivateAttr, model_validator
+
+
+class _CompiledTemplate(NamedTuple):
+    template: str  # the template and partials this was compiled from
+    template_format: str
+    partials: dict
+    parts: Optional[Tuple[str, ...]]  # literal text, with "" where a variable goes
+    slots: Tuple[Tuple[int, str], ...]  # (index into parts, variable name)
+    baked: frozenset  # partial variables already folded into the literals
+    merge_partials: bool  # callable partials still need resolving per render
+
+
+class CompiledPromptTemplate(PromptTemplate):
+    """Drop-in PromptTemplate that parses its f-string template only once.
+
+    The template is dedented and stripped when the prompt is built, static
+    partial variables (e.g. parser format instructions) are baked into the
+    literal text, and every render just fills the variable slots and joins
+    the precomputed pieces.
+    """
+
+    _compiled: Optional[_CompiledTemplate] = PrivateAttr(default=None)
+
+    @model_validator(mode="before")
+    @classmethod
+    def dedent_template(cls, values: Any) -> Any:
+        """Remove the indentation of triple-quoted templates."""
+        if isinstance(values, dict) and isinstance(values.get("template"), str):
+            values = {**values, "template": textwrap.dedent(values["template"]).strip()}
+        return values
+
+    def model_post_init(self, context: Any) -> None:
+        super().model_post_init(context)
+        self._compiled = self._compile()
+
+    def _compile(self) -> _CompiledTemplate:
+        """Split the template into literal and variable segments.
+
+        `parts` is None when LangChain has to render the template itself.
+        """
+        compiled = _CompiledTemplate(
+            template=self.template,
+            template_format=self.template_format,
+            partials=dict(self.partial_variables),
+            parts=None,
+            slots=(),
+            baked=frozenset(),
+            merge_partials=True,
+        )
+        if self.template_format != "f-string":
+            return compiled
+
+        baked = {k: v for k, v in self.partial_variables.items() if isinstance(v, str)}
+        parts: List[str] = []
+        slots: List[Tuple[int, str]] = []
+        literal = ""
+
+        for text, field, spec, conversion in Formatter().parse(self.template):
+            literal += text
+            if field is None:
+                continue
+            if spec or conversion or not field.isidentifier():
+                # Attribute access, format specs etc. - leave it to LangChain
+                return compiled
+            if field in baked:
+                literal += baked[field]
+                continue
+            if literal:
+                parts.append(literal)
+                literal = ""
+            slots.append((len(parts), field))
+            parts.append("")
+
+        if literal:
+            parts.append(literal)
+
+        return compiled._replace(
+            parts=tuple(parts),
+            slots=tuple(slots),
+            baked=frozenset(baked),
+            merge_partials=len(baked) != len(self.partial_variables),
+        )
+
+    def format(self, **kwargs: Any) -> str:
+        """Format the prompt by filling the precompiled slots."""
+        # Read the private attribute directly: going through pydantic's
+        # __getattr__ costs more than the whole render.
+        private = self.__pydantic_private__
+        fields = self.__dict__
+        compiled = private["_compiled"]
+        if (
+            compiled.template is not fields["template"]
+            or compiled.template_format != fields["template_format"]
+            or compiled.partials != fields["partial_variables"]
+        ):
+            # Changed by assignment or model_copy(update=...) since the last render
+            compiled = private["_compiled"] = self._compile()
+        if compiled.parts is None or not compiled.baked.isdisjoint(kwargs):
+            return super().format(**kwargs)
+
+        if compiled.merge_partials:
+            kwargs = self._merge_partial_and_user_variables(**kwargs)
+
+        parts = list(compiled.parts)
+        for index, name in compiled.slots:
+            # Same conversion str.format applies to a bare {name} field
+            parts[index] = format(kwargs[name], "")
+        return "".join(parts)
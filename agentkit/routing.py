@@ -0,0 +1,264 @@
+"""Hedged requests and fallback tiers for chat models.
+
+HedgedChatModel wraps the real chat model(s) and is used anywhere a chat
+model is: `prompt | llm | parser`, `create_tool_calling_agent(llm=...)`.
+If the model has not answered by the tier's p95 latency, a duplicate
+request is sent and whichever answer comes back first wins.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable
+from pydantic import ConfigDict, PrivateAttr
+
+
+class LatencyTracker:
+    """Rolling window of observed latencies for one model tier."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float) -> float:
+        with self._lock:
+            samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+@dataclass
+class RoutingStats:
+    calls: int = 0
+    hedged: int = 0  # calls that sent a duplicate request because the first was slow
+    hedge_wins: int = 0  # calls answered by the duplicate
+    retried: int = 0  # calls whose first request failed and was sent again
+    low_priority: int = 0  # calls served by the fallback tier
+    recovered: int = 0  # failed calls answered by the other tier
+
+
+@dataclass
+class _Shared:
+    """State shared by a router and its bind_tools/with_priority copies."""
+
+    pool: ThreadPoolExecutor
+    trackers: Dict[str, LatencyTracker]
+    stats: RoutingStats
+    lock: threading.Lock
+
+
+class HedgedChatModel(BaseChatModel):
+    """Chat model router with p95-based request hedging and a fallback tier.
+
+    - `primary` answers normal calls; `fallback` is a cheaper/faster tier
+      that answers `with_priority("low")` calls. When every attempt on one
+      tier fails, the call is answered by the other.
+    - Each tier tracks its own latencies. Once `min_samples` are in, a call
+      that has not finished by the `hedge_quantile` latency gets one
+      duplicate request; until then `initial_hedge_after` seconds is used.
+    - Losing requests are cancelled. Async calls are cancelled outright;
+      sync calls run in threads, so a request already on the wire is only
+      abandoned.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    primary: Runnable
+    fallback: Optional[Runnable] = None
+    priority: str = "normal"
+    hedge_quantile: float = 0.95
+    initial_hedge_after: float = 2.0
+    min_samples: int = 20
+    max_workers: int = 32
+
+    _shared: Optional[_Shared] = PrivateAttr(default=None)
+
+    def model_post_init(self, context: Any) -> None:
+        super().model_post_init(context)
+        if self._shared is None:
+            self._shared = _Shared(
+                pool=ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hedge"),
+                trackers={"primary": LatencyTracker(), "fallback": LatencyTracker()},
+                stats=RoutingStats(),
+                lock=threading.Lock(),
+            )
+
+    @property
+    def _llm_type(self) -> str:
+        return "hedged"
+
+    @property
+    def stats(self) -> RoutingStats:
+        return self._shared.stats
+
+    def with_priority(self, priority: str) -> "HedgedChatModel":
+        """Copy of this router for "low" or "normal" priority calls"""
+        return self._copy(priority=priority)
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "HedgedChatModel":
+        return self._copy(
+            primary=self.primary.bind_tools(tools, **kwargs),
+            fallback=self.fallback.bind_tools(tools, **kwargs) if self.fallback is not None else None,
+        )
+
+    def _copy(self, **update: Any) -> "HedgedChatModel":
+        # model_copy keeps _shared, so stats and latencies stay in one place
+        return self.model_copy(update=update)
+
+    def _count(self, **counts: int) -> None:
+        with self._shared.lock:
+            for field, count in counts.items():
+                setattr(self._shared.stats, field, getattr(self._shared.stats, field) + count)
+
+    def _tier(self) -> str:
+        if self.priority == "low" and self.fallback is not None:
+            return "fallback"
+        return "primary"
+
+    @staticmethod
+    def _other(tier: str) -> str:
+        return "primary" if tier == "fallback" else "fallback"
+
+    def _deadline(self, tier: str) -> float:
+        tracker = self._shared.trackers[tier]
+        if len(tracker) < self.min_samples:
+            return self.initial_hedge_after
+        return tracker.quantile(self.hedge_quantile)
+
+    def _invoke(self, tier: str, messages: List[BaseMessage], stop: Optional[List[str]], **kwargs: Any):
+        model = self.primary if tier == "primary" else self.fallback
+        return model.invoke(messages, stop=stop, **kwargs)
+
+    async def _ainvoke(self, tier: str, messages: List[BaseMessage], stop: Optional[List[str]], **kwargs: Any):
+        model = self.primary if tier == "primary" else self.fallback
+        return await model.ainvoke(messages, stop=stop, **kwargs)
+
+    def _answered(self, tier: str, start: float, first_won: bool, retry: bool) -> None:
+        """Record one latency sample per call, measured from the first request.
+
+        When the duplicate wins, the first request's elapsed time so far is a
+        lower bound of its latency. Recording it keeps slow requests in the
+        window even though they are cancelled; recording only the requests
+        that finish would drag the quantile (and the deadline) down.
+        """
+        self._shared.trackers[tier].record(time.perf_counter() - start)
+        self._count(hedge_wins=int(not first_won and not retry))
+
+    def _second_request(self, first) -> bool:
+        """Count the duplicate as a retry if the first failed, else as a hedge"""
+        retry = first.done()
+        self._count(**{"retried" if retry else "hedged": 1})
+        return retry
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tier = self._tier()
+        self._count(calls=1, low_priority=int(tier == "fallback"))
+
+        submit = functools.partial(self._shared.pool.submit, self._invoke, messages=messages, stop=stop, **kwargs)
+        try:
+            message = self._race(tier, submit)
+        except Exception:
+            if self.fallback is None:
+                raise
+            message = self._invoke(self._other(tier), messages, stop, **kwargs)
+            self._count(recovered=1)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _race(self, tier: str, submit) -> BaseMessage:
+        """Run the request, hedge it past the deadline, return the first answer"""
+        start = time.perf_counter()
+        first = submit(tier)
+        pending = {first}
+        retry: Optional[bool] = None
+        error: Optional[BaseException] = None
+
+        done, _ = wait(pending, timeout=self._deadline(tier))
+        while True:
+            for future in done:
+                pending.discard(future)
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    self._answered(tier, start, first_won=future is first, retry=bool(retry))
+                    return future.result()
+                error = error or future.exception()
+
+            if retry is None:
+                # Too slow, or failed already: send the duplicate
+                retry = self._second_request(first)
+                pending.add(submit(tier))
+            if not pending:
+                raise error
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tier = self._tier()
+        self._count(calls=1, low_priority=int(tier == "fallback"))
+
+        def submit(tier: str) -> asyncio.Task:
+            return asyncio.ensure_future(self._ainvoke(tier, messages, stop, **kwargs))
+
+        try:
+            message = await self._arace(tier, submit)
+        except Exception:
+            if self.fallback is None:
+                raise
+            message = await self._ainvoke(self._other(tier), messages, stop, **kwargs)
+            self._count(recovered=1)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _arace(self, tier: str, submit) -> BaseMessage:
+        """Async version of _race; losing requests are cancelled"""
+        start = time.perf_counter()
+        first = submit(tier)
+        pending = {first}
+        retry: Optional[bool] = None
+        error: Optional[BaseException] = None
+
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self._deadline(tier))
+            while True:
+                for task in done:
+                    pending.discard(task)
+                    if task.exception() is None:
+                        self._answered(tier, start, first_won=task is first, retry=bool(retry))
+                        return task.result()
+                    error = error or task.exception()
+
+                if retry is None:
+                    retry = self._second_request(first)
+                    pending.add(submit(tier))
+                if not pending:
+                    raise error
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,125 @@
+"""On-disk cache for Pydantic JSON schemas and the format instructions built from them.
+
+PydanticOutputParser format instructions embed the model's JSON schema,
+and generating it walks the whole model in every process that builds the
+prompt. Schemas are stored as small JSON files keyed by the path, mtime
+and size of the source files that define the model and every model
+nested in it, plus the library versions. Any edit to those files, or an
+upgrade, simply misses the cache. The key is computed once per model per
+process.
+
+Models without a source file on disk (built with create_model, defined in
+`python -c`) are not cached.
+
+The cache lives in $AGENTKIT_CACHE_DIR, or ~/.cache/agentkit by default.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import typing
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set, Tuple, Type
+
+import pydantic
+from pydantic import BaseModel
+
+
+def cache_dir() -> Path:
+    return Path(os.getenv("AGENTKIT_CACHE_DIR") or Path.home() / ".cache" / "agentkit")
+
+
+def _models(model: Type[BaseModel], seen: Set[type]) -> None:
+    """Collect the model, its bases and every model used in a field annotation"""
+    if model in seen:
+        return
+    seen.add(model)
+    for base in model.__mro__[1:]:
+        if isinstance(base, type) and issubclass(base, BaseModel) and base is not BaseModel:
+            _models(base, seen)
+
+    pending = [field.annotation for field in model.model_fields.values()]
+    while pending:
+        annotation = pending.pop()
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            _models(annotation, seen)
+        pending.extend(typing.get_args(annotation))
+
+
+_fingerprints: Dict[Tuple[type, str], Optional[str]] = {}
+
+
+def _source_stats(model: Type[BaseModel]) -> Optional[list]:
+    """(path, mtime, size) of the files defining the model and its nested models, or None"""
+    models: Set[type] = set()
+    _models(model, models)
+    files = set()
+    for nested in models:
+        path = getattr(sys.modules.get(nested.__module__), "__file__", None)
+        if not path:
+            return None
+        files.add(path)
+    stats = []
+    for path in sorted(files):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        stats.append((path, stat.st_mtime_ns, stat.st_size))
+    return stats
+
+
+def _fingerprint(model: Type[BaseModel], kind: str) -> Optional[str]:
+    """Cache key for the model, computed once per process; None if it has no source files"""
+    if (model, kind) not in _fingerprints:
+        import langchain_core
+
+        stats = _source_stats(model)
+        fingerprint = None
+        if stats is not None:
+            key = [kind, model.__module__, model.__qualname__, pydantic.VERSION, langchain_core.__version__, stats]
+            fingerprint = hashlib.sha256(json.dumps(key).encode()).hexdigest()[:20]
+        _fingerprints[model, kind] = fingerprint
+    return _fingerprints[model, kind]
+
+
+def _cached(model: Type[BaseModel], kind: str, build: Callable[[], Any]) -> Any:
+    fingerprint = _fingerprint(model, kind)
+    if fingerprint is None:
+        return build()
+    path = cache_dir() / f"{model.__name__}-{kind}-{fingerprint}.json"
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass
+
+    value = build()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename, so concurrent processes never
+        # read a half-written entry
+        with tempfile.NamedTemporaryFile("w", dir=path.parent, delete=False, encoding="utf-8") as tmp:
+            json.dump(value, tmp)
+        os.replace(tmp.name, path)
+    except OSError:
+        # A read-only filesystem just means no caching
+        pass
+    return value
+
+
+def cached_json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """model.model_json_schema(), cached on disk"""
+    return _cached(model, "schema", model.model_json_schema)
+
+
+def cached_format_instructions(model: Type[BaseModel]) -> str:
+    """PydanticOutputParser(pydantic_object=model).get_format_instructions(), from the cached schema"""
+    # Same template and steps as get_format_instructions(); the cache key covers the langchain-core version
+    from langchain_core.output_parsers.pydantic import _PYDANTIC_FORMAT_INSTRUCTIONS
+
+    schema = dict(cached_json_schema(model))
+    schema.pop("title", None)
+    schema.pop("type", None)
+    return _PYDANTIC_FORMAT_INSTRUCTIONS.format(schema=json.dumps(schema, ensure_ascii=False))
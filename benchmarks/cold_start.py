@@ -0,0 +1,153 @@
+"""Cold-start timings for agentkit.entry, with an import-time breakdown.
+
+Every measurement runs in a fresh interpreter:
+
+- eager: the imports the example scripts used to do at the top of the file
+  (Gemini client, langchain.output_parsers, langchain.agents), then the
+  component
+- entry: `import agentkit.entry` only
+- cold cache: first component ready, empty schema cache
+- warm cache: first component ready, schema cache filled by an earlier run
+
+It also times the format instructions for the Pydantic models in the
+component's script, in a fresh interpreter with the script already
+loaded: read from a warm cache, and generated by
+PydanticOutputParser.get_format_instructions() as the scripts used to.
+
+The component is built with the real Gemini model (a dummy API key is set;
+nothing is sent). The breakdown runs `python -X importtime` for the warm
+case and sums the self time of every module by top-level package.
+
+    python benchmarks/cold_start.py --component job_application
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+from examples import ROOT
+
+from agentkit.entry import COMPONENTS
+
+EAGER_IMPORTS = "import dotenv, langchain_google_genai, langchain.output_parsers, langchain.agents"
+
+READY = (
+    "import sys, time; start = time.perf_counter(); {prelude}"
+    "from agentkit.entry import get_component; get_component(sys.argv[1]); "
+    "print(time.perf_counter() - start)"
+)
+
+SCENARIOS = {
+    "eager": READY.format(prelude=EAGER_IMPORTS + "; "),
+    "entry": "import time; start = time.perf_counter(); import agentkit.entry; print(time.perf_counter() - start)",
+    "cold cache": READY.format(prelude=""),
+    "warm cache": READY.format(prelude=""),
+}
+
+FORMAT_INSTRUCTIONS = (
+    "import sys, time; from pydantic import BaseModel; "
+    "from langchain_core.output_parsers import PydanticOutputParser; "
+    "from agentkit.entry import COMPONENTS; from agentkit.examples import load_example; "
+    "from agentkit.schema_cache import cached_format_instructions; "
+    "module = load_example(COMPONENTS[sys.argv[1]].script); "
+    "models = [v for v in vars(module).values() if isinstance(v, type) and issubclass(v, BaseModel) "
+    "and v.__module__ == module.__name__]; "
+    "start = time.perf_counter(); [{build} for model in models]; "
+    "print(len(models)); print(time.perf_counter() - start)"
+)
+INSTRUCTIONS = {
+    "cache hit": FORMAT_INSTRUCTIONS.format(build="cached_format_instructions(model)"),
+    "get_format_instructions()": FORMAT_INSTRUCTIONS.format(
+        build="PydanticOutputParser(pydantic_object=model).get_format_instructions()"
+    ),
+}
+
+
+def run(code, component, cache_dir, *flags):
+    env = {**os.environ, "AGENTKIT_CACHE_DIR": cache_dir, "GOOGLE_API_KEY": os.getenv("GOOGLE_API_KEY", "offline")}
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code, component],
+        check=True, capture_output=True, text=True, cwd=ROOT, env=env,
+    )
+
+
+def measure(scenario, component, repeat):
+    """Median seconds for a scenario; cold runs get a fresh cache dir each time"""
+    timings = []
+    with tempfile.TemporaryDirectory() as warm_dir:
+        if scenario == "warm cache":
+            run(SCENARIOS[scenario], component, warm_dir)
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as cold_dir:
+                cache_dir = warm_dir if scenario == "warm cache" else cold_dir
+                output = run(SCENARIOS[scenario], component, cache_dir).stdout
+            timings.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def instructions_timing(component, repeat):
+    """Number of models, and median seconds per way of getting their format instructions"""
+    timings = defaultdict(list)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        run(INSTRUCTIONS["cache hit"], component, cache_dir)
+        for _ in range(repeat):
+            for name, code in INSTRUCTIONS.items():
+                count, seconds = run(code, component, cache_dir).stdout.split()[-2:]
+                timings[name].append(float(seconds))
+    return int(count), {name: statistics.median(values) for name, values in timings.items()}
+
+
+def import_breakdown(component):
+    """Self import time (seconds) summed by top-level package, and module count"""
+    totals = defaultdict(float)
+    counts = defaultdict(int)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        run(SCENARIOS["warm cache"], component, cache_dir)
+        stderr = run(SCENARIOS["warm cache"], component, cache_dir, "-X", "importtime").stderr
+
+    # Lines look like "import time:       412 |       1020 |   langchain_core.runnables"
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        totals[package] += int(self_us) / 1e6
+        counts[package] += 1
+    return totals, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--component", choices=sorted(COMPONENTS), default="job_application")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12, help="packages shown in the breakdown")
+    args = parser.parse_args()
+
+    print(f"Cold start for {args.component} (median of {args.repeat} fresh interpreters)\n")
+    results = {}
+    for scenario in SCENARIOS:
+        results[scenario] = measure(scenario, args.component, args.repeat)
+        print(f"  {scenario:<12} {results[scenario] * 1000:>8.0f} ms")
+    saved = results["eager"] - results["warm cache"]
+    print(f"\n  warm cache vs eager: {saved * 1000:.0f} ms less ({saved / results['eager']:.0%})")
+
+    count, timings = instructions_timing(args.component, args.repeat)
+    if count:
+        print(f"\nFormat instructions, fresh interpreter with the script loaded ({count} Pydantic models)\n")
+        for name, seconds in timings.items():
+            print(f"  {name:<26} {seconds * 1000:>8.2f} ms")
+
+    totals, counts = import_breakdown(args.component)
+    total = sum(totals.values())
+    print(f"\nImport time by package, warm cache (-X importtime self time, {total * 1000:.0f} ms total)\n")
+    print(f"  {'package':<28} {'ms':>8} {'share':>7} {'modules':>8}")
+    for package, seconds in sorted(totals.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {package:<28} {seconds * 1000:>8.1f} {seconds / total:>7.1%} {counts[package]:>8}")
+
+
+if __name__ == "__main__":
+    main()
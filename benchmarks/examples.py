@@ -0,0 +1,12 @@
+"""Put the repo root on sys.path so benchmarks can use agentkit."""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from agentkit.examples import load_example  # noqa: E402
+
+__all__ = ["ROOT", "load_example"]
@@ -0,0 +1,113 @@
+"""Tail-latency simulation for HedgedChatModel.
+
+The primary model's latency has a lognormal body and a Pareto tail (a few
+percent of calls are many times slower than the median). The same request
+stream is sent to the bare model and to the hedged router; the fallback tier
+is measured with low-priority calls.
+
+    python benchmarks/hedging.py --requests 1000 --concurrency 16
+
+--check exits non-zero when the share of hedged calls strays from the
+designed 1 - hedge_quantile (5% at p95) by more than --rate-tolerance.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+import examples  # noqa: F401  (puts the repo root on sys.path)
+from langchain_core.messages import AIMessage
+
+from agentkit.fake import ScriptedChatModel, latency_sampler
+from agentkit.routing import HedgedChatModel
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+
+    def pick(q):
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    return {"p50": pick(0.50), "p90": pick(0.90), "p95": pick(0.95), "p99": pick(0.99), "max": samples[-1]}
+
+
+async def drive(model, requests, concurrency):
+    """Send `requests` calls with at most `concurrency` in flight, return latencies"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await model.ainvoke("Summarise this job posting")
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+def report(name, latencies, extra=""):
+    stats = percentiles(latencies)
+    cells = " ".join(f"{stats[key] * 1000:>8.0f}" for key in ("p50", "p90", "p95", "p99", "max"))
+    print(f"{name:<22} {cells}   {extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--median-ms", type=float, default=40, help="primary median latency")
+    parser.add_argument("--tail-share", type=float, default=0.05, help="share of calls in the slow tail")
+    parser.add_argument("--tail-alpha", type=float, default=1.3, help="Pareto shape, lower is heavier")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--check", action="store_true", help="fail if the hedge rate is off target")
+    parser.add_argument("--rate-tolerance", type=float, default=0.5, help="allowed relative hedge-rate error")
+    args = parser.parse_args()
+
+    median = args.median_ms / 1000
+    answer = [AIMessage(content="ok")]
+    seeds = iter(range(args.seed, args.seed + 100))
+
+    def model(median):
+        latency = latency_sampler(
+            "heavy_tailed", median, tail_share=args.tail_share, tail_alpha=args.tail_alpha, seed=next(seeds)
+        )
+        return ScriptedChatModel(responses=answer, latency=latency)
+
+    def primary():
+        return model(median)
+
+    def fallback():
+        return model(median / 2)
+
+    print(f"{'latency (ms)':<22} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+
+    bare = asyncio.run(drive(primary(), args.requests, args.concurrency))
+    report("single model", bare)
+
+    router = HedgedChatModel(primary=primary(), fallback=fallback(), initial_hedge_after=median * 3)
+    hedged = asyncio.run(drive(router, args.requests, args.concurrency))
+    stats = router.stats
+    report("hedged (p95)", hedged,
+           f"+{(stats.hedged + stats.retried) / stats.calls:.1%} requests, {stats.hedge_wins} hedge wins")
+    hedge_rate = stats.hedged / stats.calls
+    target = 1 - router.hedge_quantile
+
+    low = router.with_priority("low")
+    before = stats.low_priority
+    low_latencies = asyncio.run(drive(low, args.requests, args.concurrency))
+    report("low priority (tier 2)", low_latencies, f"{stats.low_priority - before} calls on fallback tier")
+
+    print(f"\np99: {percentiles(bare)['p99'] * 1000:.0f}ms -> {percentiles(hedged)['p99'] * 1000:.0f}ms, "
+          f"mean: {statistics.mean(bare) * 1000:.0f}ms -> {statistics.mean(hedged) * 1000:.0f}ms")
+    print(f"hedge rate: {hedge_rate:.1%} of calls (designed {target:.1%}), {stats.retried} retried after errors")
+
+    if args.check and abs(hedge_rate - target) > args.rate_tolerance * target:
+        print(f"Hedge rate is off by more than {args.rate_tolerance:.0%} of the designed rate")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Event-loop lag and throughput with and without the ParseStage process pool.
+
+An asyncio network stage keeps `--concurrency` fake LLM calls in flight
+(ScriptedChatModel with recorded completions and a lognormal latency). Each
+completion is then parsed: CompetitorAnalysis (validated and formatted),
+JobAnalysis, CoverLetterContent and the Day 3/1 sentiment block. This runs
+twice, once parsing inline on the event loop and once through ParseStage. A
+monitor task sleeps `--tick-ms` at a time and records how late it wakes up.
+That delay is the event-loop lag every in-flight request also sees.
+
+    python benchmarks/parse_pool.py --requests 1000 --workers 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+from examples import load_example
+from langchain_core.messages import AIMessage
+
+from agentkit.fake import ScriptedChatModel, latency_sampler
+from agentkit.postprocess import ParseSpec, ParseStage, run_spec
+
+RECORDINGS = Path(__file__).resolve().parent / "recordings"
+
+SENTIMENT = ParseSpec(parser="Day 3/1-few-shot-rompting.py:parse_sentiment")
+SENTIMENT_BLOCK = """Sentiment: NEGATIVE
+Confidence: 85%
+Reason: Pricing complaint outweighs the neutral remark about features"""
+
+
+def workload():
+    """(spec, completion) pairs, one per kind of output the examples parse"""
+    competitor = load_example("Day 3/3-structured-output-with-pydantic.py")
+    assistant = load_example("Day 3/4-smart-job-application-assistant.py")
+    recorded = {
+        entry.get("match"): entry["message"]["content"]
+        for name in ("competitor_analyzer", "job_application_assistant")
+        for entry in json.loads((RECORDINGS / f"{name}.json").read_text(encoding="utf-8"))
+    }
+    return [
+        (competitor.COMPETITOR_REPORT, recorded[None]),
+        (assistant.JOB_ANALYSIS_PARSE, recorded["senior recruiter"]),
+        (assistant.COVER_LETTER_PARSE, recorded["career coach"]),
+        (SENTIMENT, SENTIMENT_BLOCK),
+    ]
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+async def monitor(tick, lags, stop):
+    """Record how late each `tick`-second sleep wakes up"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(tick)
+        lags.append(loop.time() - start - tick)
+
+
+async def run(args, pairs, workers):
+    models = [
+        ScriptedChatModel(
+            responses=[AIMessage(content=text)],
+            latency=latency_sampler("lognormal", args.latency_ms / 1000, seed=args.seed + i),
+        )
+        for i, (_, text) in enumerate(pairs)
+    ]
+    lags = []
+    stop = asyncio.Event()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    backlog = {"now": 0, "peak": 0}  # completions received but not parsed yet
+
+    async with ParseStage(
+        workers=workers, batch_size=args.batch_size, max_pending=args.max_pending, preload=[spec for spec, _ in pairs]
+    ) as stage:
+
+        async def one(i):
+            spec, _ = pairs[i % len(pairs)]
+            async with semaphore:
+                message = await models[i % len(models)].ainvoke("prompt")
+                backlog["now"] += 1
+                backlog["peak"] = max(backlog["peak"], backlog["now"])
+                # Queue while holding the network slot: a full parse queue stops new LLM calls
+                parsed = await stage.submit(spec, message.content)
+            await parsed
+            backlog["now"] -= 1
+
+        watcher = asyncio.create_task(monitor(args.tick_ms / 1000, lags, stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await watcher
+        return elapsed, lags, stage.stats, backlog["peak"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=64, help="LLM calls in flight")
+    parser.add_argument("--latency-ms", type=float, default=20, help="median fake LLM latency")
+    parser.add_argument("--workers", type=int, default=max(2, min(4, os.cpu_count() or 1)))
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--max-pending", type=int, default=256, help="parse queue bound (backpressure)")
+    parser.add_argument("--tick-ms", type=float, default=1.0, help="lag monitor interval")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    pairs = workload()
+    start = time.perf_counter()
+    for _ in range(50):
+        for spec, text in pairs:
+            run_spec(spec, text)
+    parse_cost = (time.perf_counter() - start) / (50 * len(pairs))
+
+    print(f"{args.requests} requests, {args.concurrency} in flight, {args.latency_ms:.0f}ms median LLM latency, "
+          f"{parse_cost * 1e6:.0f}us mean parse cost, {os.cpu_count()} CPUs\n")
+    print(f"{'parse stage':<18} {'req/s':>8} {'lag p50':>9} {'lag p99':>9} {'lag max':>9}   notes")
+
+    results = {}
+    for name, workers in (("inline", 0), (f"pool ({args.workers} proc)", args.workers)):
+        elapsed, lags, stats, peak_backlog = asyncio.run(run(args, pairs, workers))
+        results[name] = (elapsed, lags)
+        notes = ""
+        if workers:
+            notes = (f"mean batch {stats.mean_batch:.1f}, {stats.blocked} blocked by backpressure, "
+                     f"at most {peak_backlog} completions waiting")
+        print(f"{name:<18} {args.requests / elapsed:>8.0f} {percentile(lags, 0.5) * 1000:>7.2f}ms "
+              f"{percentile(lags, 0.99) * 1000:>7.2f}ms {max(lags) * 1000:>7.2f}ms   {notes}")
+
+    (inline_time, inline_lags), (pool_time, pool_lags) = results.values()
+    print(f"\nlag p99: {percentile(inline_lags, 0.99) * 1000:.2f}ms -> {percentile(pool_lags, 0.99) * 1000:.2f}ms, "
+          f"throughput: {args.requests / inline_time:.0f} -> {args.requests / pool_time:.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Render-throughput microbenchmark: PromptTemplate vs CompiledPromptTemplate.
+
+Templates are pulled straight out of the Day 2-4 scripts with `ast`, so the
+examples are never executed (they call the LLM at import time).
+
+    python benchmarks/prompt_render.py --number 20000
+"""
+
+import argparse
+import ast
+import sys
+import textwrap
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from langchain_core.prompts import PromptTemplate
+
+from agentkit import CompiledPromptTemplate
+
+DAYS = ["Day 2", "Day 3", "Day 4"]
+TEMPLATE_CLASSES = {"PromptTemplate", "CompiledPromptTemplate"}
+
+# Stand-ins for user input and for PydanticOutputParser format instructions
+SAMPLE_VALUE = "Senior Frontend Developer with 6 years of React and TypeScript. " * 4
+SAMPLE_FORMAT_INSTRUCTIONS = "The output should be formatted as a JSON instance. " * 30
+
+
+def find_templates(path):
+    """Yield (name, template, partial variable names) for every PromptTemplate in a script."""
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+
+    # Module-level `promptTemplate = """..."""` assignments
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant):
+            for target in node.targets:
+                if isinstance(target, ast.Name) and isinstance(node.value.value, str):
+                    constants[target.id] = node.value.value
+
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)):
+            continue
+        if node.func.id not in TEMPLATE_CLASSES:
+            continue
+
+        keywords = {kw.arg: kw.value for kw in node.keywords}
+        template = keywords.get("template")
+        if isinstance(template, ast.Constant):
+            template = template.value
+        elif isinstance(template, ast.Name):
+            template = constants.get(template.id)
+        if not isinstance(template, str):
+            continue
+
+        partials = []
+        if isinstance(keywords.get("partial_variables"), ast.Dict):
+            partials = [key.value for key in keywords["partial_variables"].keys]
+
+        yield f"{path.parent.name}/{path.name}:{node.lineno}", template, partials
+
+
+def bench(prompt, values, number):
+    """Return renders per second for prompt.format(**values)."""
+    seconds = timeit.timeit(lambda: prompt.format(**values), number=number)
+    return number / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="renders per template")
+    args = parser.parse_args()
+
+    print(f"{'template':<52} {'baseline/s':>12} {'compiled/s':>12} {'speedup':>8}")
+    total_baseline = total_compiled = 0.0
+
+    for day in DAYS:
+        for path in sorted((ROOT / day).glob("*.py")):
+            for name, template, partials in find_templates(path):
+                partial_variables = {key: SAMPLE_FORMAT_INSTRUCTIONS for key in partials}
+                baseline = PromptTemplate(template=template, partial_variables=partial_variables)
+                compiled = CompiledPromptTemplate(template=template, partial_variables=partial_variables)
+                values = {key: SAMPLE_VALUE for key in baseline.input_variables}
+
+                # Same text as the original once the indentation is removed
+                reference = PromptTemplate(
+                    template=textwrap.dedent(template).strip(),
+                    partial_variables=partial_variables,
+                )
+                assert compiled.format(**values) == reference.format(**values), name
+
+                baseline_rate = bench(baseline, values, args.number)
+                compiled_rate = bench(compiled, values, args.number)
+                total_baseline += args.number / baseline_rate
+                total_compiled += args.number / compiled_rate
+                print(
+                    f"{name:<52} {baseline_rate:>12,.0f} {compiled_rate:>12,.0f} "
+                    f"{compiled_rate / baseline_rate:>7.1f}x"
+                )
+
+    print(f"\nTotal render time: {total_baseline:.3f}s -> {total_compiled:.3f}s "
+          f"({total_baseline / total_compiled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""Offline benchmark suite for the Day 2-4 chains and agents.
+
+Every component is driven by a ReplayChatModel that serves the responses in
+benchmarks/recordings/ with a configurable latency distribution, so no API
+key or network is needed. For each component the suite measures:
+
+- import time of the example script (fresh interpreter)
+- latency percentiles over sequential requests
+- throughput with concurrent requests
+- peak Python memory (tracemalloc) while serving requests
+
+Results are written as JSON; pass a previous file to --compare to flag
+regressions.
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --compare results.json --only linkedin_chain
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from examples import ROOT, load_example
+
+from agentkit.fake import LATENCY_DISTRIBUTIONS, ReplayChatModel, latency_sampler
+
+RECORDINGS = Path(__file__).resolve().parent / "recordings"
+
+# Metrics checked by --compare, and whether higher is better
+COMPARED = {
+    "import_time_ms": False,
+    "latency_ms.p50": False,
+    "latency_ms.p95": False,
+    "throughput_rps": True,
+    "peak_memory_kib": False,
+}
+
+
+@dataclass
+class Benchmark:
+    name: str
+    script: str
+    recording: str
+    # (module, llm) -> function serving one request
+    build: Callable[[Any, Any], Callable[[Any], Any]]
+    # module -> requests to cycle through
+    requests: Callable[[Any], List[Any]]
+
+
+def _resume_analyzer(module, llm):
+    agent = module.ResumeAnalyzerAgent(llm)
+    return lambda request: agent.analyze(*request)
+
+
+def _job_application(module, llm):
+    assistant = module.JobApplicationAssistant(llm)
+
+    def run(request):
+        job_posting, background = request
+        analysis = assistant.analyze_job(job_posting)
+        assistant.generate_cover_letter(analysis, background)
+        return assistant.prepare_interview(analysis)
+
+    return run
+
+
+def _travel(module, llm):
+    executor = module.build_travel_executor(llm)
+    executor.verbose = False
+    return lambda query: module.prefetcher.invoke(executor, {"input": query})
+
+
+BENCHMARKS = [
+    Benchmark(
+        name="linkedin_chain",
+        script="Day 2/3-linkedIn-post-optimizer.py",
+        recording="linkedin_chain.json",
+        build=lambda module, llm: module.build_linkedin_chain(llm).invoke,
+        requests=lambda module: [
+            {"rough_idea": "Most people don't know how to write good prompts for AI",
+             "target_audience": "developers and tech professionals"},
+            {"rough_idea": "Side projects taught me more than my degree",
+             "target_audience": "students and junior engineers"},
+        ],
+    ),
+    Benchmark(
+        name="competitor_analyzer",
+        script="Day 3/3-structured-output-with-pydantic.py",
+        recording="competitor_analyzer.json",
+        build=lambda module, llm: module.build_competitor_analyzer(llm).invoke,
+        requests=lambda module: [
+            {"company_name": "Notion",
+             "industry_context": "Productivity and collaboration tools for knowledge workers"},
+        ],
+    ),
+    Benchmark(
+        name="ResumeAnalyzerAgent",
+        script="Day 2/4-resume-analyzer.py",
+        recording="resume_analyzer.json",
+        build=_resume_analyzer,
+        requests=lambda module: [(module.sample_resume, "Senior Frontend Developer")],
+    ),
+    Benchmark(
+        name="JobApplicationAssistant",
+        script="Day 3/4-smart-job-application-assistant.py",
+        recording="job_application_assistant.json",
+        build=_job_application,
+        requests=lambda module: [(module.sample_job_posting, module.candidate_background)],
+    ),
+    Benchmark(
+        name="travel_executor",
+        script="Day 4/2-travel-agent.py",
+        recording="travel_executor.json",
+        build=_travel,
+        requests=lambda module: [
+            "I want to visit Japan in October. I'm from the US and have a budget of $2000. What should I know?",
+            "What's the weather like in Japan in March and what are the visa requirements for US citizens?",
+            "Convert $1500 to Japanese Yen and find flights to Tokyo",
+        ],
+    ),
+]
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+
+    def pick(q):
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    return {
+        "p50": pick(0.50), "p90": pick(0.90), "p95": pick(0.95), "p99": pick(0.99),
+        "mean": statistics.mean(samples), "max": samples[-1],
+    }
+
+
+def measure_import(script: str, repeat: int) -> float:
+    """Median seconds to import the example script in a fresh interpreter"""
+    code = (
+        "import sys, time; sys.path.insert(0, sys.argv[1]); "
+        "start = time.perf_counter(); "
+        "from examples import load_example; load_example(sys.argv[2]); "
+        "print(time.perf_counter() - start)"
+    )
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", code, str(Path(__file__).resolve().parent), script],
+            check=True, capture_output=True, text=True, cwd=ROOT,
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def run_benchmark(benchmark: Benchmark, args) -> Dict[str, Any]:
+    module = load_example(benchmark.script)
+    llm = ReplayChatModel.from_file(
+        RECORDINGS / benchmark.recording,
+        latency=latency_sampler(args.latency, args.latency_ms / 1000, seed=args.seed),
+    )
+    serve = benchmark.build(module, llm)
+    requests = benchmark.requests(module)
+
+    def request(i):
+        return requests[i % len(requests)]
+
+    for i in range(args.warmup):
+        serve(request(i))
+
+    latencies = []
+    for i in range(args.requests):
+        start = time.perf_counter()
+        serve(request(i))
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(lambda i: serve(request(i)), range(args.requests)))
+    throughput = args.requests / (time.perf_counter() - start)
+
+    tracemalloc.start()
+    for i in range(args.memory_requests):
+        serve(request(i))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "import_time_ms": measure_import(benchmark.script, args.import_repeat) * 1000,
+        "latency_ms": {key: value * 1000 for key, value in percentiles(latencies).items()},
+        "throughput_rps": throughput,
+        "peak_memory_kib": peak / 1024,
+        "requests": args.requests,
+    }
+
+
+def _lookup(result: Dict[str, Any], dotted: str) -> float:
+    for key in dotted.split("."):
+        result = result[key]
+    return result
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Return a line for every metric that got worse by more than `tolerance`"""
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if previous is None:
+            continue
+        for metric, higher_is_better in COMPARED.items():
+            old, new = _lookup(previous, metric), _lookup(result, metric)
+            if not old:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            if worse > tolerance:
+                regressions.append(f"{name}: {metric} {old:.1f} -> {new:.1f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", action="append", help="benchmark name (repeatable)")
+    parser.add_argument("--requests", type=int, default=30, help="requests per measurement")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--memory-requests", type=int, default=5)
+    parser.add_argument("--import-repeat", type=int, default=3)
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=20, help="median fake LLM latency")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=Path, help="write JSON results here")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression")
+    args = parser.parse_args()
+
+    selected = [b for b in BENCHMARKS if not args.only or b.name in args.only]
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency": args.latency,
+            "latency_ms": args.latency_ms,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "benchmarks": {},
+    }
+
+    print(f"{'benchmark':<26} {'import':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8} {'peak KiB':>9}")
+    for benchmark in selected:
+        result = run_benchmark(benchmark, args)
+        results["benchmarks"][benchmark.name] = result
+        latency = result["latency_ms"]
+        print(
+            f"{benchmark.name:<26} {result['import_time_ms']:>6.0f}ms {latency['p50']:>6.1f}ms "
+            f"{latency['p95']:>6.1f}ms {latency['p99']:>6.1f}ms {result['throughput_rps']:>8.1f} "
+            f"{result['peak_memory_kib']:>9.0f}"
+        )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text(encoding="utf-8")), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            print("\n".join(f"  {line}" for line in regressions))
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Speculative tool prefetch benchmark for the Day 4 travel agent.
+
+A scripted chat model replays the tool calls Gemini makes for each query,
+and every tool sleeps to stand in for a real API. Each scenario is run with
+and without prefetching.
+
+The predictor's rules were written around the first group of queries, so
+their numbers are a best case. The held-out group uses phrasings it was not
+tuned on (nationality instead of "from", lower-case "may", no month,
+a currency the model picks differently). It shows how prefetching holds up
+on other traffic.
+
+    python benchmarks/travel_prefetch.py --llm-latency 0.8 --tool-latency 0.3
+"""
+
+import argparse
+import functools
+import statistics
+import time
+
+from examples import load_example
+from langchain.agents import AgentExecutor, create_tool_calling_agent
+from langchain_core.messages import AIMessage
+
+from agentkit.fake import ScriptedChatModel
+from agentkit.prefetch import ToolPrefetcher
+
+# (query, tool calls the model makes in its first turn)
+TUNED = [
+    (
+        "I want to visit Japan in October. I'm from the US and have a budget of $2000. What should I know?",
+        [
+            ("weather_forecast", {"location": "Japan", "month": "October"}),
+            ("visa_requirements", {"destination": "Japan", "passport": "US"}),
+            ("search_flights", {"__arg1": "Japan"}),
+            ("currency_converter", {"amount": 2000, "from_currency": "USD", "to_currency": "JPY"}),
+        ],
+    ),
+    (
+        "What's the weather like in Japan in March and what are the visa requirements for US citizens?",
+        [
+            ("weather_forecast", {"location": "japan", "month": "march"}),
+            ("visa_requirements", {"destination": "Japan", "passport": "US"}),
+        ],
+    ),
+    (
+        "Convert $1500 to Japanese Yen and find flights to Tokyo",
+        [
+            ("currency_converter", {"amount": 1500, "from_currency": "USD", "to_currency": "JPY"}),
+            ("search_flights", {"__arg1": "Tokyo"}),
+        ],
+    ),
+]
+
+HELD_OUT = [
+    (
+        "I'm Indian and planning a trip to Thailand in may, around 50000 rupees. Do I need a visa?",
+        [
+            ("visa_requirements", {"destination": "Thailand", "passport": "India"}),
+            ("weather_forecast", {"location": "Thailand", "month": "May"}),
+            ("search_flights", {"__arg1": "Thailand"}),
+        ],
+    ),
+    (
+        "Thinking about Portugal sometime next year. Are flights expensive and what's the weather usually like?",
+        [
+            ("search_flights", {"__arg1": "Portugal"}),
+        ],
+    ),
+    (
+        "We're British, heading to Canada in December with £3000. Convert that to dollars and check visas please",
+        [
+            ("visa_requirements", {"destination": "Canada", "passport": "UK"}),
+            ("weather_forecast", {"location": "Canada", "month": "December"}),
+            ("currency_converter", {"amount": 3000, "from_currency": "GBP", "to_currency": "CAD"}),
+        ],
+    ),
+]
+
+SCENARIOS = [("tuned", TUNED), ("held-out", HELD_OUT)]
+
+
+def slow(func, latency):
+    """Make a local tool behave like a network call"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        time.sleep(latency)
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def scripted_llm(calls, latency):
+    tool_turn = AIMessage(content="", tool_calls=[
+        {"name": name, "args": args, "id": f"call_{i}", "type": "tool_call"}
+        for i, (name, args) in enumerate(calls)
+    ])
+    return ScriptedChatModel(responses=[tool_turn, AIMessage(content="Here is your plan.")], latency=latency)
+
+
+def run(travel, tools, query, calls, llm_latency, prefetch):
+    """Return (seconds, prefetcher) for one agent run"""
+    prefetcher = ToolPrefetcher(tools, travel.predict_travel_calls)
+    agent_tools = prefetcher.tools if prefetch else tools
+    llm = scripted_llm(calls, llm_latency)
+    agent = create_tool_calling_agent(llm=llm, tools=agent_tools, prompt=travel.travel_agent_prompt)
+    executor = AgentExecutor(agent=agent, tools=agent_tools, handle_parsing_errors=True)
+
+    start = time.perf_counter()
+    if prefetch:
+        prefetcher.invoke(executor, {"input": query})
+    else:
+        executor.invoke({"input": query})
+    elapsed = time.perf_counter() - start
+    prefetcher.shutdown()
+    return elapsed, prefetcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="seconds per LLM turn")
+    parser.add_argument("--tool-latency", type=float, default=0.3, help="seconds per tool call")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    travel = load_example("Day 4/2-travel-agent.py")
+    tools = [
+        tool.model_copy(update={"func": slow(tool.func, args.tool_latency)})
+        for tool in travel.travel_tools
+    ]
+
+    print(f"{'scenario':<42} {'baseline':>9} {'prefetch':>9} {'hits':>5} {'miss':>5} {'waste':>6}")
+    summaries = []
+    for group, scenarios in SCENARIOS:
+        print(f"-- {group}")
+        summaries.append((group, run_group(travel, tools, scenarios, args)))
+
+    for group, (totals, baseline_total, prefetch_total) in summaries:
+        calls = totals["hits"] + totals["misses"]
+        print(f"\n{group}:")
+        print(f"  Hit rate: {totals['hits'] / calls:.0%} of tool calls served from a prefetch")
+        print(f"  Wasted work: {totals['wasted']} of {totals['prefetched']} speculative calls unused")
+        print(f"  End-to-end: {baseline_total:.2f}s -> {prefetch_total:.2f}s "
+              f"({1 - prefetch_total / baseline_total:.0%} faster)")
+
+
+def run_group(travel, tools, scenarios, args):
+    """Run every scenario with and without prefetch; return (totals, baseline s, prefetch s)"""
+    totals = {"hits": 0, "misses": 0, "wasted": 0, "prefetched": 0}
+    baseline_total = prefetch_total = 0.0
+    for query, calls in scenarios:
+        baseline = [run(travel, tools, query, calls, args.llm_latency, False)[0] for _ in range(args.repeat)]
+        runs = [run(travel, tools, query, calls, args.llm_latency, True) for _ in range(args.repeat)]
+        prefetched = [elapsed for elapsed, _ in runs]
+        stats = runs[-1][1].stats
+        for _, prefetcher in runs:
+            for key in totals:
+                totals[key] += getattr(prefetcher.stats, key)
+
+        baseline_total += statistics.median(baseline)
+        prefetch_total += statistics.median(prefetched)
+        print(
+            f"{query[:40] + '..':<42} {statistics.median(baseline):>8.2f}s {statistics.median(prefetched):>8.2f}s "
+            f"{stats.hits:>5} {stats.misses:>5} {stats.wasted:>6}"
+        )
+
+    return totals, baseline_total, prefetch_total
+
+
+if __name__ == "__main__":
+    main()